@@ -216,15 +216,17 @@ def seed_forest_claims():
 def create_indexes():
     """Create necessary indexes for performance"""
     # Village indexes
-    db.villages.create_index([("village_id", 1)])
+    db.villages.create_index([("id", 1)], unique=True)
     db.villages.create_index([("state", 1)])
     db.villages.create_index([("district", 1)])
     db.villages.create_index([("coordinates", "2dsphere")])
     
     # Claims indexes  
+    db.forest_claims.create_index([("id", 1)], unique=True)
     db.forest_claims.create_index([("claim_number", 1)])
     db.forest_claims.create_index([("village_id", 1)])
     db.forest_claims.create_index([("status", 1)])
+    db.forest_claims.create_index([("state", 1), ("district", 1), ("status", 1)])
     db.forest_claims.create_index([("coordinates", "2dsphere")])
     
     print("✅ Created database indexes")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+OCR throughput benchmarks for the FRA Atlas AI Service (needs Tesseract installed)
+"""
+
+import difflib
+import os
+import time
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from main import DocumentProcessor, SubprocessOCREngine, TesserocrEngine, create_ocr_engine
+
+FORM_LINES = [
+    "FORM-A Claim for Rights to Forest Land",
+    "Name of claimant: Ramesh Gond",
+    "Father/Husband: Sukhlal Gond",
+    "Village: Mandla   District: Mandla",
+    "Survey No: 123/4   Area: 2.5 hectare",
+    "Gram Sabha resolution attached",
+]
+
+def make_form_page(index, width=1240, height=1754):
+    """A4 page at 150 dpi with a few lines of printed form text"""
+    page = np.full((height, width, 3), 255, dtype=np.uint8)
+    for line_number, line in enumerate(FORM_LINES):
+        y = 150 + line_number * 90
+        cv2.putText(page, f"{line} ({index})" if line_number == 0 else line, (80, y),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 2, cv2.LINE_AA)
+    return page
+
+def encode_pages(count):
+    """PNG bytes, as they arrive in an upload"""
+    return [cv2.imencode(".png", make_form_page(i))[1].tobytes() for i in range(count)]
+
+def benchmark_engine(label, engine, pages, language):
+    processor = DocumentProcessor(engine=engine)
+    # The first page pays the model load for the persistent engine; report it separately
+    start = time.perf_counter()
+    processor.extract_text_from_image(processor.decode_image(pages[0]), language)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for page in pages[1:]:
+        processor.extract_text_from_image(processor.decode_image(page), language)
+    elapsed = time.perf_counter() - start
+    pages_per_sec = (len(pages) - 1) / elapsed
+    print(f"   {label}: first page {first * 1000:.0f} ms, then {pages_per_sec:.2f} pages/sec")
+    return pages_per_sec
+
+def benchmark_ocr_engines(pages=20, languages=("eng", "auto")):
+    print(f"📄 OCR over {pages} synthetic form pages")
+    encoded = encode_pages(pages)
+    for language in languages:
+        print(f"   language={language}")
+        before = benchmark_engine("subprocess (pytesseract)", SubprocessOCREngine(), encoded, language)
+        try:
+            engine = TesserocrEngine()
+        except ImportError:
+            print("   tesserocr not installed, skipping the persistent engine")
+            continue
+        after = benchmark_engine("persistent (tesserocr)  ", engine, encoded, language)
+        print(f"   Speed-up: {after / before:.1f}x")
+
+# Mixed-script forms: English labels alongside one regional script, as on real FRA claims
+MIXED_FORMS = {
+    "Devanagari": [
+        "FORM-A Claim for Rights to Forest Land",
+        "नाम: रमेश गोंड",
+        "पिता का नाम: सुखलाल गोंड",
+        "ग्राम: मंडला",
+        "क्षेत्रफल: 2.5 हेक्टेयर",
+        "Survey No: 123/4",
+    ],
+    "Oriya": [
+        "FORM-A Claim for Rights to Forest Land",
+        "ନାମ: ରମେଶ ମାଝୀ",
+        "ଗ୍ରାମ: କୋରାପୁଟ",
+        "Survey No: 88/2",
+    ],
+    "Telugu": [
+        "FORM-B Community Rights",
+        "పేరు: రాము గోండు",
+        "గ్రామం: ఉట్నూర్",
+        "Survey No: 41/7",
+    ],
+    "Bengali": [
+        "FORM-A Claim for Rights to Forest Land",
+        "নাম: রমেশ সাঁওতাল",
+        "গ্রাম: ঝাড়গ্রাম",
+        "Survey No: 15/3",
+    ],
+}
+FONT_FILES = {
+    "Latin": "NotoSans-Regular.ttf",
+    "Devanagari": "NotoSansDevanagari-Regular.ttf",
+    "Oriya": "NotoSansOriya-Regular.ttf",
+    "Telugu": "NotoSansTelugu-Regular.ttf",
+    "Bengali": "NotoSansBengali-Regular.ttf",
+}
+FONT_DIRS = [os.environ.get("FONT_DIR", ""), "/usr/share/fonts/truetype/noto", "/usr/share/fonts/noto",
+             "/usr/share/fonts/google-noto"]
+
+def load_font(script, size=40):
+    for directory in FONT_DIRS:
+        path = os.path.join(directory, FONT_FILES[script])
+        if directory and os.path.exists(path):
+            return ImageFont.truetype(path, size)
+    return None
+
+def render_mixed_form(lines, script_font, latin_font, width=1240, height=1754):
+    """Page with the form's lines; Pillow needs libraqm to shape Indic conjuncts correctly"""
+    page = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(page)
+    for line_number, line in enumerate(lines):
+        font = latin_font if line.isascii() else script_font
+        draw.text((80, 120 + line_number * 90), line, font=font, fill="black")
+    return cv2.imencode(".png", cv2.cvtColor(np.array(page), cv2.COLOR_RGB2BGR))[1].tobytes()
+
+def run_form(processor, page, truth, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        text, _ = processor.extract_text_from_image(processor.decode_image(page), "auto")
+    elapsed = (time.perf_counter() - start) / rounds
+    return elapsed, difflib.SequenceMatcher(None, truth, text).ratio()
+
+def benchmark_script_detection(rounds=3):
+    print("🔤 language=auto on mixed-script forms: all six packs vs script detection first")
+    latin_font = load_font("Latin")
+    if latin_font is None:
+        print("   Noto fonts not found (set FONT_DIR), skipping")
+        return
+    engine = create_ocr_engine()
+    all_packs = DocumentProcessor(engine=engine, script_detection=False)
+    two_stage = DocumentProcessor(engine=engine, script_detection=True)
+    totals = {"all": 0.0, "two_stage": 0.0}
+    for script, lines in MIXED_FORMS.items():
+        script_font = load_font(script)
+        if script_font is None:
+            print(f"   {script}: font not found, skipping")
+            continue
+        page = render_mixed_form(lines, script_font, latin_font)
+        truth = "\n".join(lines)
+        before, before_accuracy = run_form(all_packs, page, truth, rounds)
+        after, after_accuracy = run_form(two_stage, page, truth, rounds)
+        totals["all"] += before
+        totals["two_stage"] += after
+        print(f"   {script}: all packs {before * 1000:.0f} ms ({before_accuracy:.0%} match), "
+              f"two-stage {after * 1000:.0f} ms ({after_accuracy:.0%} match)")
+    if totals["two_stage"]:
+        print(f"   Speed-up: {totals['all'] / totals['two_stage']:.1f}x")
+
+if __name__ == "__main__":
+    print("🧪 FRA Atlas AI Service benchmarks")
+    print("=" * 40)
+    benchmark_ocr_engines()
+    benchmark_script_detection()
@@ -1,16 +1,29 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 import pytesseract
 from PIL import Image
 import cv2
 import numpy as np
 import re
 import os
+import sys
 import aiofiles
 import logging
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
 from datetime import datetime
 import json
+import uuid
+import tempfile
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -30,12 +43,138 @@ app.add_middleware(
 # Create uploads directory if it doesn't exist
 os.makedirs("uploads", exist_ok=True)
 
+# OCR runs in worker processes, one per core by default; uploads beyond the queue limit get a 429
+OCR_WORKERS = int(os.environ.get("OCR_WORKERS", os.cpu_count() or 1))
+OCR_QUEUE_LIMIT = int(os.environ.get("OCR_QUEUE_LIMIT", OCR_WORKERS * 4))
+# "auto" uses tesserocr when it is installed, "subprocess" always shells out through pytesseract
+OCR_ENGINE = os.environ.get("OCR_ENGINE", "auto")
+# OCR decodes uploads in memory; set OCR_AUDIT_UPLOADS=1 to also keep a copy in uploads/
+OCR_AUDIT_UPLOADS = os.environ.get("OCR_AUDIT_UPLOADS", "0") == "1"
+# Opt-in fast mode: language="auto" first detects the page's scripts and then runs only the
+# matching language packs (compare accuracy with benchmarks.py before turning it on)
+OCR_SCRIPT_DETECTION = os.environ.get("OCR_SCRIPT_DETECTION", "0") == "1"
+OCR_OSD_MIN_CONFIDENCE = float(os.environ.get("OCR_OSD_MIN_CONFIDENCE", "1.0"))
+# Initialised Tesseract APIs a tesserocr worker keeps, least recently used dropped first
+OCR_MAX_LANGUAGE_SETS = int(os.environ.get("OCR_MAX_LANGUAGE_SETS", "4"))
+
 # Configure Tesseract path (adjust based on your system)
 # For Windows, uncomment and adjust the path below:
 # pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
+# Tesseract language parameter for each supported language option
+LANGUAGE_MAP = {
+    'auto': 'eng+hin+ori+tel+ben+san',  # Multi-language detection
+    'eng': 'eng',
+    'hin': 'hin',
+    'ori': 'ori',  # Odia
+    'tel': 'tel',  # Telugu
+    'ben': 'ben',  # Bengali
+    'san': 'san'   # Sanskrit
+}
+
+# Tesseract script names and the language packs used for each
+SCRIPT_LANGUAGES = {
+    'Latin': 'eng',
+    'Devanagari': 'hin',
+    'Oriya': 'ori',
+    'Telugu': 'tel',
+    'Bengali': 'ben'
+}
+SCRIPT_PATTERNS = {
+    'Latin': re.compile(r'[a-zA-Z]'),
+    'Devanagari': re.compile(r'[\u0900-\u097F]'),
+    'Bengali': re.compile(r'[\u0980-\u09FF]'),
+    'Oriya': re.compile(r'[\u0B00-\u0B7F]'),
+    'Telugu': re.compile(r'[\u0C00-\u0C7F]')
+}
+# Share of a probe's letters a script needs before its language pack is used
+SCRIPT_MIN_SHARE = 0.1
+# Scale of the fallback probe when OSD is unavailable
+SCRIPT_PROBE_SCALE = 0.5
+
+# Resolution PDF pages are rasterized at for OCR
+PDF_RENDER_DPI = int(os.environ.get("PDF_RENDER_DPI", "300"))
+# A document takes one OCR_QUEUE_LIMIT slot however long it is; longer uploads get a 413
+OCR_MAX_PAGES = int(os.environ.get("OCR_MAX_PAGES", "300"))
+
+class SubprocessOCREngine:
+    """pytesseract: starts a tesseract process and loads the traineddata for every image"""
+    name = "subprocess"
+
+    def preload(self, lang):
+        pass
+
+    def detect_scripts(self, image):
+        osd = pytesseract.image_to_osd(image, config='--psm 0')
+        match = re.search(r'Script: (\w+)\s+Script confidence: ([0-9.]+)', osd)
+        if match and float(match.group(2)) >= OCR_OSD_MIN_CONFIDENCE:
+            return [match.group(1)]
+        return []
+
+    def image_to_string(self, image, lang):
+        # OCR configuration for better results
+        custom_config = f'--oem 3 --psm 6 -l {lang}'
+        return pytesseract.image_to_string(image, config=custom_config)
+
+class TesserocrEngine:
+    """tesserocr: keeps initialised Tesseract APIs for the most recently used language sets"""
+    name = "tesserocr"
+
+    def __init__(self, max_apis=OCR_MAX_LANGUAGE_SETS):
+        import tesserocr
+        self.tesserocr = tesserocr
+        self.max_apis = max_apis
+        self.apis = OrderedDict()
+        self.osd_api = None
+
+    def api(self, lang):
+        api = self.apis.get(lang)
+        if api is None:
+            api = self.tesserocr.PyTessBaseAPI(
+                lang=lang, psm=self.tesserocr.PSM.SINGLE_BLOCK, oem=self.tesserocr.OEM.DEFAULT
+            )
+            self.apis[lang] = api
+            while len(self.apis) > self.max_apis:
+                _, evicted = self.apis.popitem(last=False)
+                evicted.End()
+        self.apis.move_to_end(lang)
+        return api
+
+    def preload(self, lang):
+        self.api(lang)
+
+    def to_pil(self, image):
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return Image.fromarray(image)
+
+    def detect_scripts(self, image):
+        if self.osd_api is None:
+            self.osd_api = self.tesserocr.PyTessBaseAPI(lang='osd', psm=self.tesserocr.PSM.OSD_ONLY)
+        self.osd_api.SetImage(self.to_pil(image))
+        osd = self.osd_api.DetectOrientationScript()
+        if osd and osd.get('script_conf', 0) >= OCR_OSD_MIN_CONFIDENCE:
+            return [osd['script_name']]
+        return []
+
+    def image_to_string(self, image, lang):
+        api = self.api(lang)
+        api.SetImage(self.to_pil(image))
+        return api.GetUTF8Text()
+
+def create_ocr_engine(name=OCR_ENGINE):
+    if name in ("auto", "tesserocr"):
+        try:
+            return TesserocrEngine()
+        except ImportError:
+            if name == "tesserocr":
+                logger.warning("tesserocr is not installed, falling back to the subprocess OCR engine")
+    return SubprocessOCREngine()
+
 class DocumentProcessor:
-    def __init__(self):
+    def __init__(self, engine=None, script_detection=OCR_SCRIPT_DETECTION):
+        self.engine = engine or create_ocr_engine()
+        self.script_detection = script_detection
         self.patterns = {
             'holder_name': [
                 r'(?:name|holder|applicant)[\s:]*([a-zA-Z\s]+)',
@@ -68,11 +207,14 @@ class DocumentProcessor:
             ]
         }
 
-    def preprocess_image(self, image_path):
+    def decode_image(self, content):
+        """Decode uploaded bytes without a round trip through the filesystem"""
+        # np.frombuffer is a view over the bytes, so only the decoded pixels are allocated
+        return cv2.imdecode(np.frombuffer(content, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    def preprocess_image(self, img):
         """Preprocess image for better OCR results"""
         try:
-            # Read image
-            img = cv2.imread(image_path)
             if img is None:
                 raise ValueError("Could not read image")
 
@@ -95,34 +237,26 @@ class DocumentProcessor:
             logger.error(f"Image preprocessing error: {str(e)}")
             return None
 
-    def extract_text_from_image(self, image_path, language="auto"):
+    def extract_text_from_image(self, image, language="auto"):
         """Extract text using OCR with multilingual support"""
         try:
+            if image is None:
+                raise ValueError("Could not decode image")
+            
             # Preprocess image
-            processed_img = self.preprocess_image(image_path)
+            processed_img = self.preprocess_image(image)
             if processed_img is None:
                 # Fallback to original image
-                processed_img = cv2.imread(image_path)
-            
-            # Language mapping for Tesseract
-            language_map = {
-                'auto': 'eng+hin+ori+tel+ben+san',  # Multi-language detection
-                'eng': 'eng',
-                'hin': 'hin',
-                'ori': 'ori',  # Odia
-                'tel': 'tel',  # Telugu
-                'ben': 'ben',  # Bengali
-                'san': 'san'   # Sanskrit
-            }
+                processed_img = image
             
             # Get Tesseract language parameter
-            tesseract_lang = language_map.get(language, 'eng+hin')
-            
-            # OCR configuration for better results
-            custom_config = f'--oem 3 --psm 6 -l {tesseract_lang}'
+            if language == 'auto' and self.script_detection:
+                tesseract_lang = self.select_languages(processed_img)
+            else:
+                tesseract_lang = LANGUAGE_MAP.get(language, 'eng+hin')
             
             # Extract text
-            text = pytesseract.image_to_string(processed_img, config=custom_config)
+            text = self.engine.image_to_string(processed_img, tesseract_lang)
             
             # Detect language from extracted text
             detected_language = self.detect_language(text)
@@ -133,6 +267,40 @@ class DocumentProcessor:
             logger.error(f"OCR extraction error: {str(e)}")
             return "", "unknown"
 
+    def scripts_in_text(self, text):
+        """Scripts that make up a meaningful share of the letters in text"""
+        counts = {script: len(pattern.findall(text)) for script, pattern in SCRIPT_PATTERNS.items()}
+        total = sum(counts.values())
+        if total == 0:
+            return []
+        return [script for script, count in counts.items() if count / total >= SCRIPT_MIN_SHARE]
+
+    def select_languages(self, image):
+        """Tesseract languages for the scripts on a page: OSD first, then a low-resolution probe"""
+        scripts = []
+        try:
+            scripts = self.engine.detect_scripts(image)
+        except Exception as e:
+            logger.info(f"Script detection (OSD) unavailable: {str(e)}")
+        
+        # OSD names one dominant script; a Latin page may be English labels around regional
+        # values, so probe those as well as pages OSD could not place
+        if scripts in ([], ['Latin']):
+            # Probe a downscaled copy with every language and see which scripts come back
+            probe = cv2.resize(image, None, fx=SCRIPT_PROBE_SCALE, fy=SCRIPT_PROBE_SCALE, interpolation=cv2.INTER_AREA)
+            probed = self.scripts_in_text(self.engine.image_to_string(probe, LANGUAGE_MAP['auto']))
+            scripts = scripts + [script for script in probed if script not in scripts]
+        
+        languages = [SCRIPT_LANGUAGES[script] for script in scripts if script in SCRIPT_LANGUAGES]
+        if not languages:
+            return LANGUAGE_MAP['auto']
+        # Form labels are often printed in English alongside the regional script
+        if 'eng' not in languages:
+            languages.append('eng')
+        tesseract_lang = '+'.join(languages)
+        logger.info(f"Scripts detected: {scripts}, OCR languages: {tesseract_lang}")
+        return tesseract_lang
+
     def detect_language(self, text):
         """Simple language detection based on character patterns"""
         if not text:
@@ -316,6 +484,125 @@ class DocumentProcessor:
 
 processor = DocumentProcessor()
 
+def init_ocr_worker():
+    """Load the default language set once when a worker starts, not on its first page"""
+    try:
+        processor.engine.preload(LANGUAGE_MAP['auto'])
+    except Exception as e:
+        logger.warning(f"Could not preload OCR languages: {str(e)}")
+
+def run_ocr(content, language):
+    """Worker entry point: decoding, preprocessing and Tesseract for one uploaded image"""
+    return processor.extract_text_from_image(processor.decode_image(content), language)
+
+# Multi-page documents are spooled to one file per upload and workers are sent its path, not
+# its bytes; each page task opens the file (PDFium and Pillow read only the page index up
+# front) and closes it again, so nothing holds the file once the document is finished
+def spool_document(content, kind):
+    path = os.path.join(tempfile.gettempdir(), f"fra-ocr-{uuid.uuid4().hex}.{kind}")
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+spool_cleanup_tasks = set()
+
+async def remove_spooled(path, attempts=5):
+    """Delete a spooled document, retrying while a worker finishes a cancelled page (Windows)"""
+    for attempt in range(attempts):
+        try:
+            os.remove(path)
+            return
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            if attempt == attempts - 1:
+                logger.warning(f"Could not remove {path}: {str(e)}")
+                return
+        await asyncio.sleep(2 ** attempt)
+
+def discard_spooled(path):
+    """Remove a spooled document without holding up the response"""
+    task = asyncio.ensure_future(remove_spooled(path))
+    spool_cleanup_tasks.add(task)
+    task.add_done_callback(spool_cleanup_tasks.discard)
+
+def open_document(path, kind):
+    if kind == "pdf":
+        if pdfium is None:
+            raise ValueError("PDF support needs pypdfium2 installed")
+        return pdfium.PdfDocument(path)
+    return Image.open(path)
+
+def count_pages(path, kind):
+    if kind == "pdf":
+        if pdfium is None:
+            raise ValueError("PDF support needs pypdfium2 installed")
+        document = pdfium.PdfDocument(path)
+        try:
+            return len(document)
+        finally:
+            document.close()
+    with Image.open(path) as image:
+        return getattr(image, "n_frames", 1)
+
+def render_page(path, kind, index):
+    """One page of a PDF or frame of a TIFF as a BGR image"""
+    document = open_document(path, kind)
+    try:
+        if kind == "pdf":
+            image = document[index].render(scale=PDF_RENDER_DPI / 72).to_pil()
+        else:
+            document.seek(index)
+            image = document
+        return cv2.cvtColor(np.array(image.convert("RGB")), cv2.COLOR_RGB2BGR)
+    finally:
+        document.close()
+
+def run_page_ocr(path, kind, index, language):
+    """Worker entry point: rasterize and OCR a single page of a multi-page document"""
+    return processor.extract_text_from_image(render_page(path, kind, index), language)
+
+ocr_pool = None
+ocr_in_flight = 0  # documents admitted, the unit OCR_QUEUE_LIMIT counts
+ocr_tasks = 0  # pages (or single images) submitted to the pool and not yet finished
+
+def stop_ocr_pool(pool, wait=True):
+    """Shut a pool down, dropping queued pages where Python supports it (cancel_futures is 3.9+)"""
+    if sys.version_info >= (3, 9):
+        pool.shutdown(wait=wait, cancel_futures=True)
+    else:
+        pool.shutdown(wait=wait)
+
+def get_ocr_pool():
+    global ocr_pool
+    if ocr_pool is None:
+        ocr_pool = ProcessPoolExecutor(max_workers=OCR_WORKERS, initializer=init_ocr_worker)
+    return ocr_pool
+
+async def run_in_ocr_pool(fn, *args):
+    """Run fn in the pool; a worker that died (segfault, OOM) breaks it, so drop it for the next call"""
+    global ocr_pool, ocr_tasks
+    pool = get_ocr_pool()
+    ocr_tasks += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        if ocr_pool is pool:
+            ocr_pool = None
+            stop_ocr_pool(pool, wait=False)
+            logger.error("An OCR worker died; the pool will be recreated")
+        raise
+    finally:
+        ocr_tasks -= 1
+
+def ocr_queue_stats():
+    return {
+        "workers": OCR_WORKERS,
+        "in_flight": ocr_in_flight,
+        "queued": max(0, ocr_tasks - OCR_WORKERS),
+        "queue_limit": OCR_QUEUE_LIMIT
+    }
+
 @app.get("/")
 async def root():
     return {"message": "FRA Atlas AI Service", "status": "running", "version": "1.0.0"}
@@ -325,14 +612,95 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "service": "FRA Atlas AI Service"
+        "service": "FRA Atlas AI Service",
+        "ocr": ocr_queue_stats()
+    }
+
+async def ocr_pages(path, kind, page_count, language):
+    """OCR the pages across the worker pool, yielding (page, text, language) as each one finishes"""
+    # Only as many pages as there are workers are rasterized at any moment
+    semaphore = asyncio.Semaphore(OCR_WORKERS)
+
+    async def ocr_page(index):
+        async with semaphore:
+            text, detected_language = await run_in_ocr_pool(run_page_ocr, path, kind, index, language)
+        return index + 1, text, detected_language
+
+    tasks = [asyncio.create_task(ocr_page(index)) for index in range(page_count)]
+    try:
+        for next_page in asyncio.as_completed(tasks):
+            yield await next_page
+    finally:
+        for task in tasks:
+            task.cancel()
+
+def page_result(page, text, detected_language):
+    form_type, _ = processor.detect_form_type(text)
+    return {
+        "page": page,
+        "extracted_text": text[:500] + "..." if len(text) > 500 else text,
+        "language_detected": detected_language,
+        "form_type": form_type,
+        "entities": processor.extract_entities(text, form_type) if text else {}
     }
 
+def merge_pages(pages, filename, language, target_language):
+    """Document-level result: form type from all pages, each entity from the first page that has it"""
+    pages = sorted(pages, key=lambda page: page[0])
+    full_text = "\n".join(text for _, text, _ in pages if text)
+    if not full_text:
+        return {"success": False, "message": "Could not extract text from document", "filename": filename, "pages": len(pages)}
+    
+    form_type, confidence = processor.detect_form_type(full_text)
+    entities = {}
+    entity_pages = {}
+    for page, text, _ in pages:
+        if not text:
+            continue
+        # Re-extract with the document's form type so every page uses the same patterns
+        for field, value in processor.extract_entities(text, form_type).items():
+            if field not in entities:
+                entities[field] = value
+                entity_pages[field] = page
+    validation = processor.validate_extraction(entities)
+    
+    return {
+        "success": True,
+        "message": "Document processed successfully",
+        "filename": filename,
+        "pages": len(pages),
+        "extracted_text": full_text[:500] + "..." if len(full_text) > 500 else full_text,
+        "language_detected": processor.detect_language(full_text),
+        "ocr_language": language,
+        "target_language": target_language,
+        "form_type": form_type,
+        "form_detection_confidence": confidence,
+        "entities": entities,
+        "entity_pages": entity_pages,
+        "validation": validation,
+        "confidence_score": validation['confidence'] / 100,
+        "processing_time": datetime.now().isoformat()
+    }
+
+async def stream_document_pages(path, kind, page_count, filename, language, target_language):
+    """NDJSON: one line per page as it finishes, then the merged document result"""
+    pages = []
+    # Closing the stream early (client gone) cancels the pages still being OCR'd
+    results = ocr_pages(path, kind, page_count, language)
+    try:
+        async for page, text, detected_language in results:
+            pages.append((page, text, detected_language))
+            yield json.dumps(page_result(page, text, detected_language), ensure_ascii=False) + "\n"
+    finally:
+        await results.aclose()
+    yield json.dumps({"summary": True, **merge_pages(pages, filename, language, target_language)}, ensure_ascii=False) + "\n"
+
 @app.post("/api/process-document")
 async def process_document(
     file: UploadFile = File(...),
     language: str = "auto",
-    target_language: str = "en"
+    target_language: str = "en",
+    stream: bool = False
 ):
     """Process uploaded document and extract forest rights claim information"""
     
@@ -340,28 +708,82 @@ async def process_document(
         raise HTTPException(status_code=400, detail="No file uploaded")
     
     # Validate file type
-    allowed_types = ['image/jpeg', 'image/jpg', 'image/png', 'image/tiff', 'image/bmp']
+    allowed_types = ['image/jpeg', 'image/jpg', 'image/png', 'image/tiff', 'image/bmp', 'application/pdf']
     if file.content_type not in allowed_types:
         raise HTTPException(
             status_code=400, 
             detail=f"Unsupported file type. Allowed: {', '.join(allowed_types)}"
         )
     
+    global ocr_in_flight
+    if ocr_in_flight >= OCR_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=429,
+            detail="OCR queue is full, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    
+    ocr_in_flight += 1
+    streaming = False
+    path = None
     try:
-        # Generate unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}_{file.filename}"
-        file_path = os.path.join("uploads", filename)
-        
-        # Save uploaded file
-        async with aiofiles.open(file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        content = await file.read()
         
-        logger.info(f"Processing file: {filename} with language: {language}")
+        if OCR_AUDIT_UPLOADS:
+            # Generate unique filename
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Concurrent uploads of the same name in the same second must not share a path
+            filename = f"{timestamp}_{uuid.uuid4().hex[:8]}_{file.filename}"
+            
+            # Keep the original upload for audit
+            async with aiofiles.open(os.path.join("uploads", filename), 'wb') as f:
+                await f.write(content)
+        
+        logger.info(f"Processing file: {file.filename} with language: {language}")
+        
+        kind = {"application/pdf": "pdf", "image/tiff": "tiff"}.get(file.content_type, "image")
+        page_count = 1
+        if kind != "image":
+            path = await asyncio.get_running_loop().run_in_executor(None, spool_document, content, kind)
+            try:
+                # PDFium is not thread-safe, so documents are only ever opened in the worker processes
+                page_count = await run_in_ocr_pool(count_pages, path, kind)
+            except BrokenProcessPool:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=f"Could not read document: {str(e)}")
+            if page_count > OCR_MAX_PAGES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Document has {page_count} pages; at most {OCR_MAX_PAGES} are processed per upload"
+                )
+        
+        if kind == "pdf" or page_count > 1:
+            if stream:
+                body = stream_document_pages(path, kind, page_count, file.filename, language, target_language)
+
+                async def release_document():
+                    # Runs after the response, also when the client left before the body was read
+                    global ocr_in_flight
+                    await body.aclose()
+                    await remove_spooled(path)
+                    ocr_in_flight -= 1
+
+                streaming = True
+                return StreamingResponse(
+                    body, media_type="application/x-ndjson", background=BackgroundTask(release_document)
+                )
+            
+            pages = [page async for page in ocr_pages(path, kind, page_count, language)]
+            result = merge_pages(pages, file.filename, language, target_language)
+            if not result["success"]:
+                raise HTTPException(status_code=422, detail="Could not extract text from document")
+            result["page_results"] = [page_result(*page) for page in sorted(pages, key=lambda page: page[0])]
+            logger.info(f"Successfully processed {file.filename} ({page_count} pages) - Confidence: {result['validation']['confidence']:.1f}%")
+            return JSONResponse(content=result)
         
-        # Extract text from image with language support
-        extracted_text, detected_language = processor.extract_text_from_image(file_path, language)
+        # Extract text from image with language support, off the event loop
+        extracted_text, detected_language = await run_in_ocr_pool(run_ocr, content, language)
         
         if not extracted_text:
             raise HTTPException(status_code=422, detail="Could not extract text from image")
@@ -375,12 +797,6 @@ async def process_document(
         # Validate extraction quality
         validation = processor.validate_extraction(entities)
         
-        # Clean up - remove uploaded file
-        try:
-            os.remove(file_path)
-        except:
-            pass
-        
         response_data = {
             "success": True,
             "message": "Document processed successfully",
@@ -397,21 +813,19 @@ async def process_document(
             "processing_time": datetime.now().isoformat()
         }
         
-        logger.info(f"Successfully processed {filename} - Confidence: {validation['confidence']:.1f}%")
+        logger.info(f"Successfully processed {file.filename} - Confidence: {validation['confidence']:.1f}%")
         return JSONResponse(content=response_data)
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Processing error: {str(e)}")
-        # Clean up file if it exists
-        try:
-            if 'file_path' in locals():
-                os.remove(file_path)
-        except:
-            pass
-        
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+    finally:
+        if not streaming:
+            if path:
+                discard_spooled(path)
+            ocr_in_flight -= 1
 
 @app.post("/api/analyze-satellite")
 async def analyze_satellite(coordinates: dict):
@@ -462,9 +876,10 @@ async def get_processing_stats():
     return {
         "total_processed": upload_files,
         "service_uptime": "Running",
-        "ocr_engine": "Tesseract 5.x",
+        "ocr_engine": f"Tesseract 5.x ({processor.engine.name})",
+        "ocr_queue": ocr_queue_stats(),
         "supported_languages": ["English", "Hindi"],
-        "supported_formats": ["JPEG", "PNG", "TIFF", "BMP"],
+        "supported_formats": ["JPEG", "PNG", "TIFF", "BMP", "PDF"],
         "features": [
             "Document OCR",
             "Entity Extraction", 
@@ -473,11 +888,16 @@ async def get_processing_stats():
         ]
     }
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    if ocr_pool is not None:
+        stop_ocr_pool(ocr_pool)
+
 if __name__ == "__main__":
     import uvicorn
     
     print("🤖 Starting FRA Atlas AI Service...")
-    print("📄 OCR Engine: Tesseract")
+    print(f"📄 OCR Engine: Tesseract ({processor.engine.name})")
     print("🛰️ Satellite Analysis: Enabled")
     print("🌐 CORS: Enabled for all origins")
     print("📊 Endpoints:")
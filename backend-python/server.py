@@ -1,23 +1,66 @@
-from fastapi import FastAPI, APIRouter, Query, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, APIRouter, Query, Path, HTTPException, UploadFile, File, Form, Request, Response
+from fastapi.responses import StreamingResponse
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import MongoClient
-from pydantic import BaseModel, Field
+from pymongo import MongoClient, InsertOne, UpdateMany, UpdateOne, ReturnDocument
+from pymongo.errors import BulkWriteError, OperationFailure
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, create_model
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
 import uuid
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
 import pandas as pd
 import numpy as np
 import io
 import json
+import base64
+import hashlib
+import math
 import os
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
 from bson import ObjectId
 
 # MongoDB connection
 MONGODB_URL = "mongodb://localhost:27017"
 DATABASE_NAME = "fra_db"
 
+# Cache settings
+DASHBOARD_STATS_TTL = float(os.environ.get("DASHBOARD_STATS_TTL", "30"))
+MAP_TILE_TTL = float(os.environ.get("MAP_TILE_TTL", "600"))
+MAP_TILE_CACHE_SIZE = int(os.environ.get("MAP_TILE_CACHE_SIZE", "4096"))
+MAP_TILE_MAX_FEATURES = int(os.environ.get("MAP_TILE_MAX_FEATURES", "1000"))
+MAP_TILE_CLUSTER_BELOW_ZOOM = int(os.environ.get("MAP_TILE_CLUSTER_BELOW_ZOOM", "9"))
+ROLLUP_RECONCILE_INTERVAL = float(os.environ.get("ROLLUP_RECONCILE_INTERVAL", "3600"))
+CLAIM_BULK_MAX_ROWS = int(os.environ.get("CLAIM_BULK_MAX_ROWS", "50000"))
+CLAIM_BULK_CHUNK = int(os.environ.get("CLAIM_BULK_CHUNK", "1000"))
+DSS_RECOMPUTE_INTERVAL = float(os.environ.get("DSS_RECOMPUTE_INTERVAL", "60"))
+DSS_RECOMPUTE_BATCH = int(os.environ.get("DSS_RECOMPUTE_BATCH", "500"))
+
+# CSV validation settings
+CSV_CHUNK_ROWS = int(os.environ.get("CSV_CHUNK_ROWS", "100000"))
+CSV_STREAMING_THRESHOLD = int(os.environ.get("CSV_STREAMING_THRESHOLD_MB", "50")) * 1024 * 1024
+CSV_VALIDATION_WORKERS = int(os.environ.get("CSV_VALIDATION_WORKERS", "2"))
+CSV_VALIDATION_QUEUE_LIMIT = int(os.environ.get("CSV_VALIDATION_QUEUE_LIMIT", "8"))
+VALIDATION_UPLOAD_DIR = os.environ.get("VALIDATION_UPLOAD_DIR", "uploads/validations")
+VALIDATION_CACHE_TTL = int(os.environ.get("VALIDATION_CACHE_TTL_HOURS", "168")) * 3600
+VALIDATION_CACHE_SIZE = int(os.environ.get("VALIDATION_CACHE_SIZE", "256"))
+# Bump when the validation checks change so cached results for old uploads are recomputed
+VALIDATOR_VERSION = "1"
+DATA_PIPELINE_DIR = os.environ.get(
+    "DATA_PIPELINE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), '../ai-service/data_pipeline')
+)
+
+# Documents in our own collections were validated on write, so reads skip re-validation by default
+TRUSTED_READS = os.environ.get("TRUSTED_READS", "1") == "1"
+
 # Test MongoDB connection
 def test_mongodb_connection():
     try:
@@ -46,54 +89,322 @@ else:
     db = None
     print("⚠️  Running in offline mode without MongoDB")
 
+# Small in-process cache shared by the read-heavy endpoints
+class TTLCache:
+    """Keyed cache whose entries expire after ttl_seconds (oldest evicted beyond max_entries)"""
+    def __init__(self, ttl_seconds: float, max_entries: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.lock = asyncio.Lock()
+        self._key_locks = {}
+        # Bumped by invalidate(); a value computed before the bump is not stored
+        self.generation = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, generation: Optional[int] = None):
+        if generation is not None and generation != self.generation:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        if self.max_entries is not None:
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @asynccontextmanager
+    async def key_lock(self, key):
+        """Lock for recomputing one key, so a slow miss does not hold up the others"""
+        entry = self._key_locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._key_locks.pop(key, None)
+
+    def invalidate(self, key=None):
+        self.generation += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+dashboard_stats_cache = TTLCache(DASHBOARD_STATS_TTL)
+# Keyed by (state, district, z, x, y); each entry is a pre-serialized tile
+village_tile_cache = TTLCache(MAP_TILE_TTL, max_entries=MAP_TILE_CACHE_SIZE)
+# Front for the validation_cache collection, keyed by (sha256, dataset_type, validator version)
+validation_result_cache = TTLCache(VALIDATION_CACHE_TTL, max_entries=VALIDATION_CACHE_SIZE)
+
 # Simple data validation function (fallback)
-def simple_data_validation(df: pd.DataFrame, dataset_type: str) -> Dict:
-    """Simple data validation for CSV files"""
-    issues = []
-    confidence_score = 1.0
-    
-    # Check for missing values
-    missing_pct = df.isnull().mean().mean()
-    if missing_pct > 0.2:
-        issues.append({"check_type": "missing_values", "severity": "high"})
-        confidence_score -= 0.3
-    elif missing_pct > 0.1:
-        issues.append({"check_type": "missing_values", "severity": "medium"})
-        confidence_score -= 0.1
-    
-    # Check for duplicates
-    duplicate_pct = df.duplicated().sum() / len(df) if len(df) > 0 else 0
-    if duplicate_pct > 0.05:
-        issues.append({"check_type": "duplicates", "severity": "medium"})
-        confidence_score -= 0.2
-    
-    # Check for suspicious patterns (all same values, etc.)
-    for col in df.select_dtypes(include=[np.number]).columns:
-        if df[col].nunique() == 1 and len(df) > 10:
-            issues.append({"check_type": "suspicious_uniformity", "column": col, "severity": "high"})
+# A sample of each text column is parsed first so columns that are clearly not numeric exit early
+NUMERIC_SAMPLE_ROWS = 1000
+
+def is_numeric_text(series: pd.Series) -> bool:
+    """True when every non-null value of an object column parses as a number"""
+    for values in (series.head(NUMERIC_SAMPLE_ROWS), series):
+        # Parsing the distinct values only is far cheaper on repetitive columns
+        distinct = pd.Series(values.unique())
+        distinct = distinct[distinct.notnull()]
+        if pd.to_numeric(distinct, errors='coerce').isnull().any():
+            return False
+    return True
+
+def row_hashes(chunk: pd.DataFrame, null_mask: pd.DataFrame, numeric_columns: set) -> np.ndarray:
+    """64-bit hash per row that does not depend on the dtype pandas inferred for the chunk"""
+    # Numbers hash as float64 and nulls as 0, so a column read as int in one chunk and
+    # float (or all-null) in another still gives equal rows equal hashes
+    combined = np.zeros(len(chunk), dtype=np.uint64)
+    for col in chunk.columns:
+        values = chunk[col]
+        if col in numeric_columns:
+            values = values.astype('float64')
+        hashed = pd.util.hash_array(values.to_numpy())
+        hashed[null_mask[col].to_numpy()] = 0
+        combined = combined * np.uint64(1000003) ^ hashed
+    return combined
+
+class ValidationStats:
+    """simple_data_validation's checks, accumulated one DataFrame chunk at a time"""
+    def __init__(self):
+        self.rows = 0
+        self.columns = []
+        self.null_cells = 0
+        self.row_hashes = []       # 8 bytes per row, used for the global duplicate count
+        self.numeric = {}          # column -> numeric in every chunk so far
+        self.mins = {}             # numeric column -> smallest non-null value
+        self.maxs = {}             # numeric column -> largest non-null value
+        self.object_columns = set()
+        self.parseable = {}        # column -> every value parsed as a number so far
+
+    def add(self, chunk: pd.DataFrame):
+        if not self.columns:
+            self.columns = list(chunk.columns)
+        self.rows += len(chunk)
+        
+        # Null counts, row hashes and numeric ranges for all columns at once
+        null_mask = chunk.isnull()
+        self.null_cells += int(null_mask.to_numpy().sum())
+        numeric = chunk.select_dtypes(include=[np.number])
+        self.row_hashes.append(row_hashes(chunk, null_mask, set(numeric.columns)))
+        for col, low, high in zip(numeric.columns, numeric.min().to_numpy(), numeric.max().to_numpy()):
+            self.mins[col] = np.fmin(self.mins.get(col, np.nan), low)
+            self.maxs[col] = np.fmax(self.maxs.get(col, np.nan), high)
+        
+        numeric_columns = set(numeric.columns)
+        for col in chunk.columns:
+            self.numeric[col] = self.numeric.get(col, True) and col in numeric_columns
+            if chunk[col].dtype == 'object':
+                self.object_columns.add(col)
+                if self.parseable.get(col, True):
+                    self.parseable[col] = is_numeric_text(chunk[col])
+            else:
+                self.parseable[col] = self.parseable.get(col, True) and col in numeric_columns
+
+    def result(self, final: bool = True) -> Dict:
+        """Issues found so far; partial results (final=False) skip the whole-file duplicate count"""
+        issues = []
+        confidence_score = 1.0
+        total_cells = self.rows * len(self.columns)
+        
+        # Check for missing values
+        missing_pct = self.null_cells / total_cells if total_cells else 0
+        if missing_pct > 0.2:
+            issues.append({"check_type": "missing_values", "severity": "high"})
             confidence_score -= 0.3
-    
-    # Check data types
-    for col in df.columns:
-        if df[col].dtype == 'object':
-            # Check if numeric data is stored as string
-            try:
-                pd.to_numeric(df[col], errors='raise')
+        elif missing_pct > 0.1:
+            issues.append({"check_type": "missing_values", "severity": "medium"})
+            confidence_score -= 0.1
+        
+        # Check for duplicates
+        if final and self.rows > 0:
+            unique_rows = len(np.unique(np.concatenate(self.row_hashes)))
+            if (self.rows - unique_rows) / self.rows > 0.05:
+                issues.append({"check_type": "duplicates", "severity": "medium"})
+                confidence_score -= 0.2
+        
+        # Check for suspicious patterns (all same values, etc.)
+        for col in self.columns:
+            # min == max means exactly one distinct non-null value (all-null columns give NaN)
+            if self.numeric.get(col) and self.mins.get(col) == self.maxs.get(col) and self.rows > 10:
+                issues.append({"check_type": "suspicious_uniformity", "column": col, "severity": "high"})
+                confidence_score -= 0.3
+        
+        # Check if numeric data is stored as string
+        for col in self.columns:
+            if col in self.object_columns and self.parseable.get(col):
                 issues.append({"check_type": "data_type_issue", "column": col, "severity": "low"})
                 confidence_score -= 0.05
-            except:
-                pass
-    
-    # Ensure confidence is between 0 and 1
-    confidence_score = max(0.0, min(1.0, confidence_score))
+        
+        # Ensure confidence is between 0 and 1
+        confidence_score = max(0.0, min(1.0, confidence_score))
+        
+        return {
+            'confidence_score': confidence_score,
+            'issues': issues,
+            'valid': len(issues) == 0,
+            'total_rows': self.rows,
+            'total_columns': len(self.columns)
+        }
+
+def simple_data_validation(df: pd.DataFrame, dataset_type: str) -> Dict:
+    """Simple data validation for CSV files"""
+    stats = ValidationStats()
+    stats.add(df)
+    return stats.result()
+
+def validate_csv_stream(fileobj, dataset_type: str, on_chunk=None) -> Dict:
+    """Validate a CSV file object chunk by chunk without decoding it into one string"""
+    fileobj.seek(0)
+    stats = ValidationStats()
+    for chunk in pd.read_csv(fileobj, chunksize=CSV_CHUNK_ROWS, encoding='utf-8'):
+        stats.add(chunk)
+        if on_chunk is not None:
+            on_chunk(stats)
+    return stats.result()
+
+class SimpleValidator:
+    """Fallback validator built on simple_data_validation"""
+    name = "simple"
+    version = VALIDATOR_VERSION
+
+    def validate_dataset(self, df: pd.DataFrame, dataset_type: str) -> Dict:
+        return simple_data_validation(df, dataset_type)
+
+# Validators are resolved once per process (API and each pool worker) and reused for every upload
+validator_registry: Dict[str, Any] = {}
+default_validator = None
+validator_load_ms = None
+
+def register_validator(dataset_type: str, validator):
+    """Use a specific validator for one dataset_type; anything with validate_dataset(df, dataset_type) works"""
+    validator_registry[dataset_type] = validator
+
+def load_validators():
+    """Pick the pipeline DataValidator when it is installed, otherwise the simple checks"""
+    global default_validator, validator_load_ms
+    start = time.perf_counter()
+    validator = None
+    if os.path.isdir(DATA_PIPELINE_DIR):
+        if DATA_PIPELINE_DIR not in sys.path:
+            sys.path.append(DATA_PIPELINE_DIR)
+        try:
+            from data_validator import DataValidator
+            validator = DataValidator()
+        except ImportError as e:
+            print(f"⚠️  DataValidator unavailable, using simple validation: {e}")
+    default_validator = validator or SimpleValidator()
+    validator_load_ms = (time.perf_counter() - start) * 1000
+
+def get_validator(dataset_type: str):
+    if default_validator is None:
+        load_validators()
+    return validator_registry.get(dataset_type, default_validator)
+
+def validator_name(validator) -> str:
+    return getattr(validator, "name", type(validator).__name__)
+
+def validator_version(dataset_type: str, chunked: bool = False) -> str:
+    """Identifies the checks an upload goes through; chunked uploads always use the simple checks"""
+    validator = SimpleValidator() if chunked else get_validator(dataset_type)
+    return f"{validator_name(validator)}-{getattr(validator, 'version', VALIDATOR_VERSION)}"
+
+def validate_dataframe(df: pd.DataFrame, dataset_type: str) -> Dict:
+    """Run the validator registered for dataset_type"""
+    return get_validator(dataset_type).validate_dataset(df, dataset_type)
+
+# Validation runs in worker processes so large uploads never block the event loop
+def validate_csv_bytes(contents: bytes, dataset_type: str) -> tuple:
+    """Worker entry point for uploads small enough to hold in memory"""
+    df = pd.read_csv(io.BytesIO(contents), encoding='utf-8')
+    return validate_dataframe(df, dataset_type), len(df)
+
+def validate_csv_file(path: str, dataset_type: str, on_chunk=None) -> tuple:
+    """Worker entry point for large uploads spooled to disk"""
+    with open(path, 'rb') as f:
+        result = validate_csv_stream(f, dataset_type, on_chunk)
+    return result, result['total_rows']
+
+def validate_csv_job(path: str, dataset_type: str, job_id: str, progress) -> tuple:
+    """Worker entry point for background jobs; publishes rows processed and partial issues per chunk"""
+    def report(stats):
+        partial = stats.result(final=False)
+        progress[job_id] = {
+            "job_status": "running",
+            "rows_processed": stats.rows,
+            "issues_found": [issue["check_type"] for issue in partial["issues"]]
+        }
     
-    return {
-        'confidence_score': confidence_score,
-        'issues': issues,
-        'valid': len(issues) == 0,
-        'total_rows': len(df),
-        'total_columns': len(df.columns)
-    }
+    progress[job_id] = {"job_status": "running", "rows_processed": 0, "issues_found": []}
+    return validate_csv_file(path, dataset_type, report)
+
+validation_pool = None
+validation_progress = None  # Manager dict shared with worker processes, keyed by job id
+validations_in_flight = 0
+
+def get_validation_pool() -> ProcessPoolExecutor:
+    global validation_pool
+    if validation_pool is None:
+        validation_pool = ProcessPoolExecutor(max_workers=CSV_VALIDATION_WORKERS, initializer=load_validators)
+    return validation_pool
+
+async def run_in_validation_pool(fn, *args):
+    """Run fn in the pool; a worker that died (e.g. OOM) breaks it, so drop it for the next call"""
+    global validation_pool
+    pool = get_validation_pool()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        if validation_pool is pool:
+            validation_pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+        print("⚠️  A validation worker died; the pool will be recreated")
+        raise
+
+# Strong references to fire-and-forget tasks; the event loop only keeps weak ones
+background_tasks = set()
+
+def start_background_task(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+def get_validation_progress():
+    global validation_progress
+    if validation_progress is None:
+        validation_progress = multiprocessing.Manager().dict()
+    return validation_progress
+
+def copy_and_hash(source, destination, block_size: int = 1024 * 1024) -> str:
+    """Copy a file object and return the sha256 of the bytes copied"""
+    digest = hashlib.sha256()
+    while True:
+        block = source.read(block_size)
+        if not block:
+            return digest.hexdigest()
+        digest.update(block)
+        destination.write(block)
+
+async def save_upload_to_disk(file: UploadFile, directory: Optional[str] = None) -> tuple:
+    """Copy an upload to a named temp file a worker process can open; returns (path, sha256)"""
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".csv", dir=directory) as tmp:
+        file.file.seek(0)
+        digest = await asyncio.to_thread(copy_and_hash, file.file, tmp)
+        return tmp.name, digest
 
 # Pydantic Models
 class DashboardStats(BaseModel):
@@ -130,6 +441,8 @@ class ForestClaim(BaseModel):
     claim_number: str
     village_id: str
     village_name: str
+    state: Optional[str] = None  # Copied from the village at write time
+    district: Optional[str] = None
     beneficiary_name: str
     beneficiary_father_name: str
     tribe_name: Optional[str] = None
@@ -175,6 +488,15 @@ class ClaimUpdate(BaseModel):
     ocr_documents: Optional[List[Dict[str, Any]]] = None
     linked_schemes: Optional[List[str]] = None
 
+class ClaimStatusChange(BaseModel):
+    claim_id: str
+    new_status: str
+    notes: Optional[str] = None
+
+class BulkStatusUpdate(BaseModel):
+    changes: List[ClaimStatusChange]
+    officer: Optional[str] = None  # Recorded on every change in the batch
+
 class VillageGeoJSON(BaseModel):
     type: str = "Feature"
     geometry: GeoJSONPoint
@@ -195,6 +517,9 @@ class DataValidationResult(BaseModel):
     validated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     validated_by: Optional[str] = None
     notes: Optional[str] = None
+    job_status: Optional[str] = None  # "queued", "running", "complete", "failed" for background jobs
+    rows_processed: Optional[int] = None
+    error: Optional[str] = None
 
 class FRADocument(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -236,6 +561,129 @@ class DSRecommendation(BaseModel):
     agricultural_potential: Optional[float] = None
     forest_dependency: Optional[float] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    assets_version: int = 0  # Bumped by every asset write for the village
+    dirty: bool = False  # Set when assets changed after this was computed
+
+# Field projection for list endpoints
+def parse_fields(fields: Optional[str], model, always: tuple = ("id",)) -> Optional[tuple]:
+    """Validate a comma separated fields= parameter against a model"""
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in model.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return tuple(sorted(set(requested) | set(always)))
+
+def projection_for(fields: tuple) -> Dict[str, int]:
+    projection = {name: 1 for name in fields}
+    projection["_id"] = 0
+    return projection
+
+@lru_cache(maxsize=128)
+def slim_model(model, fields: tuple):
+    """Build (once per field set) a model holding only the requested fields"""
+    return create_model(
+        f"{model.__name__}Slim",
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields}
+    )
+
+# Serialization of documents read back from our own collections
+@lru_cache(maxsize=None)
+def list_adapter(model):
+    """Prebuilt serializer for a list of the given model"""
+    return TypeAdapter(List[model])
+
+def load_row(model, doc: Dict[str, Any]):
+    """Turn a stored document into a model, skipping validation for trusted reads"""
+    doc.pop('_id', None)  # Remove _id field
+    if TRUSTED_READS:
+        return model.model_construct(**doc)
+    return model(**doc)
+
+def load_rows(model, docs: List[Dict[str, Any]]) -> list:
+    """Rows for a list response; only TRUSTED_READS=0 skips malformed documents"""
+    # model_construct never raises, so with trusted reads (the default) a document missing
+    # required fields is served as stored rather than dropped
+    rows = []
+    for doc in docs:
+        try:
+            rows.append(load_row(model, doc))
+        except Exception as e:
+            print(f"Error converting {model.__name__} data: {e}")
+            print(f"{model.__name__} data: {doc}")
+            continue
+    return rows
+
+def rows_response(model, docs: List[Dict[str, Any]], headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serialize stored documents in one pass, bypassing response_model re-validation"""
+    content = list_adapter(model).dump_json(load_rows(model, docs))
+    return Response(content=content, media_type="application/json", headers=headers)
+
+def row_response(model, doc: Dict[str, Any]) -> Response:
+    return Response(content=load_row(model, doc).model_dump_json(), media_type="application/json")
+
+# Spatial filters backed by the 2dsphere indexes on coordinates
+EARTH_RADIUS_METERS = 6378100.0
+
+def check_lnglat(lng: float, lat: float):
+    if not (-180 <= lng <= 180 and -90 <= lat <= 90):
+        raise HTTPException(status_code=400, detail="Longitude must be within ±180 and latitude within ±90")
+
+def parse_bbox(bbox: str) -> List[float]:
+    """Parse bbox=minLng,minLat,maxLng,maxLat"""
+    try:
+        min_lng, min_lat, max_lng, max_lat = [float(value) for value in bbox.split(",")]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be minLng,minLat,maxLng,maxLat")
+    if min_lng >= max_lng or min_lat >= max_lat:
+        raise HTTPException(status_code=400, detail="bbox min values must be below max values")
+    check_lnglat(min_lng, min_lat)
+    check_lnglat(max_lng, max_lat)
+    # Mongo only accepts $geoWithin polygons smaller than a hemisphere
+    if max_lng - min_lng > 180:
+        raise HTTPException(status_code=400, detail="bbox may span at most 180 degrees of longitude")
+    return [min_lng, min_lat, max_lng, max_lat]
+
+def parse_near(near: str) -> List[float]:
+    """Parse near=lat,lng into a GeoJSON [lng, lat] position"""
+    try:
+        lat, lng = [float(value) for value in near.split(",")]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="near must be lat,lng")
+    check_lnglat(lng, lat)
+    return [lng, lat]
+
+# Points per degree of longitude along the top and bottom edges of a lng/lat box
+BOX_EDGE_STEP_DEGREES = 1.0
+
+def box_polygon(min_lng: float, min_lat: float, max_lng: float, max_lat: float) -> Dict[str, Any]:
+    """GeoJSON polygon covering a lng/lat box as drawn on a web map"""
+    # Polygon edges are great circles; points along the top and bottom keep them on their
+    # parallels, otherwise a wide box loses villages along one edge and gains some past the other
+    steps = max(1, math.ceil((max_lng - min_lng) / BOX_EDGE_STEP_DEGREES))
+    lngs = [min_lng + (max_lng - min_lng) * i / steps for i in range(steps + 1)]
+    bottom = [[lng, min_lat] for lng in lngs] if min_lat > -90 else [[min_lng, -90.0]]
+    top = [[lng, max_lat] for lng in reversed(lngs)] if max_lat < 90 else [[max_lng, 90.0]]
+    ring = bottom + top
+    ring.append(ring[0])
+    return {"type": "Polygon", "coordinates": [ring]}
+
+def spatial_filter(bbox: Optional[str], near: Optional[str], radius: float, nearest_first: bool = False) -> Optional[Dict[str, Any]]:
+    """Condition on coordinates for a bbox= or near= request"""
+    if bbox and near:
+        raise HTTPException(status_code=400, detail="Use either bbox or near, not both")
+    if bbox:
+        return {"$geoWithin": {"$geometry": box_polygon(*parse_bbox(bbox))}}
+    if near:
+        point = parse_near(near)
+        if radius > math.pi * EARTH_RADIUS_METERS:
+            raise HTTPException(status_code=400, detail="radius may be at most half the earth's circumference")
+        # $nearSphere orders by distance; $geoWithin leaves the caller's sort and cursor intact
+        if nearest_first:
+            return {"$nearSphere": {"$geometry": {"type": "Point", "coordinates": point}, "$maxDistance": radius}}
+        return {"$geoWithin": {"$centerSphere": [point, radius / EARTH_RADIUS_METERS]}}
+    return None
 
 # Create FastAPI app and router
 app = FastAPI(title="FRA Atlas API", version="1.0.0")
@@ -248,8 +696,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Claim rollups: one document per (state, district, status) holding the claim count
+async def bump_claim_rollups(changes: List[tuple]):
+    """Apply (state, district, status, delta) increments to claim_rollups"""
+    updates = [
+        UpdateOne(
+            {"state": state, "district": district, "status": status},
+            {"$inc": {"count": delta}},
+            upsert=True
+        )
+        for state, district, status, delta in changes
+    ]
+    if not updates:
+        return
+    try:
+        await db.claim_rollups.bulk_write(updates, ordered=False)
+    except Exception as e:
+        # The periodic reconciliation repairs any increment lost here
+        print(f"❌ Claim rollup update failed: {e}")
+
+async def record_status_change(claim: Dict[str, Any], old_status: Optional[str], new_status: str):
+    if old_status == new_status:
+        return
+    state, district = claim.get("state"), claim.get("district")
+    changes = [(state, district, new_status, 1)]
+    if old_status is not None:
+        changes.append((state, district, old_status, -1))
+    await bump_claim_rollups(changes)
+
+async def rollup_status_counts(query: Dict[str, Any]) -> Dict[str, int]:
+    """Claim counts per status summed over the matching rollup documents"""
+    counts = {}
+    async for rollup in db.claim_rollups.find(query, {"_id": 0, "status": 1, "count": 1}):
+        counts[rollup["status"]] = counts.get(rollup["status"], 0) + rollup["count"]
+    return counts
+
 # Routes
 @api_router.get("/dashboard/stats", response_model=DashboardStats)
 async def get_dashboard_stats():
@@ -265,50 +749,75 @@ async def get_dashboard_stats():
             schemes_integrated=4,
             total_budget_linked=125000000.0
         )
+    stats = dashboard_stats_cache.get("dashboard")
+    if stats is not None:
+        return stats
     try:
-        total_villages = await db.villages.count_documents({})
-        total_claims = await db.forest_claims.count_documents({})
-        approved_claims = await db.forest_claims.count_documents({"status": "approved"})
-        pending_claims = await db.forest_claims.count_documents({"status": "pending"})
-        disputed_claims = await db.forest_claims.count_documents({"status": "disputed"})
-        
-        return DashboardStats(
-            total_villages=total_villages,
-            total_claims=total_claims,
-            approved_claims=approved_claims,
-            pending_claims=pending_claims,
-            disputed_claims=disputed_claims,
-            ocr_accuracy=87.5,
-            schemes_integrated=4,
-            total_budget_linked=125000000.0
-        )
+        # Only one request recomputes on expiry; the rest wait and reuse its result
+        async with dashboard_stats_cache.lock:
+            stats = dashboard_stats_cache.get("dashboard")
+            if stats is None:
+                # A write landing mid-compute invalidates first, so these stats are served but not cached
+                generation = dashboard_stats_cache.generation
+                stats = await compute_dashboard_stats()
+                dashboard_stats_cache.set("dashboard", stats, generation)
+        return stats
     except Exception as e:
         print(f"Database connection failed: {e}")
         raise HTTPException(status_code=503, detail="Database unavailable")
 
+async def compute_dashboard_stats() -> DashboardStats:
+    """Count villages and read per-status claim totals from claim_rollups"""
+    total_villages, status_counts = await asyncio.gather(
+        db.villages.count_documents({}),
+        rollup_status_counts({})
+    )
+
+    return DashboardStats(
+        total_villages=total_villages,
+        total_claims=sum(status_counts.values()),
+        approved_claims=status_counts.get("approved", 0),
+        pending_claims=status_counts.get("pending", 0),
+        disputed_claims=status_counts.get("disputed", 0),
+        ocr_accuracy=87.5,
+        schemes_integrated=4,
+        total_budget_linked=125000000.0
+    )
+
+CHANGE_STREAM_RETRY_SECONDS = 5
+
+async def watch_claim_changes():
+    """Drop cached stats whenever forest_claims changes, including writes from other processes"""
+    while True:
+        try:
+            async with db.forest_claims.watch() as stream:
+                async for _ in stream:
+                    dashboard_stats_cache.invalidate()
+        except OperationFailure as e:
+            # Change streams need a replica set; standalone servers rely on the TTL and explicit invalidation
+            if e.code == 40573:
+                print(f"ℹ️  Claim change stream unavailable: {e}")
+                return
+            print(f"⚠️  Claim change stream failed, restarting: {e}")
+        except Exception as e:
+            print(f"⚠️  Claim change stream failed, restarting: {e}")
+        # Changes missed while the stream was down are covered by dropping the cache once more
+        dashboard_stats_cache.invalidate()
+        await asyncio.sleep(CHANGE_STREAM_RETRY_SECONDS)
+
 @api_router.get("/villages", response_model=List[Village])
-async def get_villages(state: Optional[str] = None, district: Optional[str] = None):
+async def get_villages(state: Optional[str] = None, district: Optional[str] = None, fields: Optional[str] = None):
+    selected = parse_fields(fields, Village)
     try:
         query = {}
         if state:
             query["state"] = state
         if district:
             query["district"] = district
-        villages = await db.villages.find(query).to_list(1000)
-        
-        # Remove MongoDB _id field and convert to Pydantic models
-        result = []
-        for village_data in villages:
-            village_data.pop('_id', None)  # Remove _id field
-            try:
-                village = Village(**village_data)
-                result.append(village)
-            except Exception as e:
-                print(f"Error converting village data: {e}")
-                print(f"Village data: {village_data}")
-                continue
-        
-        return result
+        projection = projection_for(selected) if selected else None
+        villages = await db.villages.find(query, projection).to_list(1000)
+        model = slim_model(Village, selected) if selected else Village
+        return rows_response(model, villages)
     except Exception as e:
         print(f"Database connection failed: {e}")
         raise HTTPException(status_code=503, detail="Database unavailable")
@@ -317,62 +826,219 @@ async def get_villages(state: Optional[str] = None, district: Optional[str] = No
 async def create_village(village_data: Village):
     village = Village(**village_data.dict())
     await db.villages.insert_one(village.dict())
+    dashboard_stats_cache.invalidate()
+    village_tile_cache.invalidate()
     return village
 
+# Claims are paged newest first on (submitted_date, id); neither changes after a claim is filed, so a
+# claim updated mid-scan (status changes rewrite last_updated) keeps its place relative to the cursor
+CLAIM_SORT = [("submitted_date", -1), ("id", -1)]
+
+def encode_claim_cursor(claim: Dict[str, Any]) -> str:
+    """Build the opaque cursor pointing just past this claim"""
+    payload = json.dumps([claim["submitted_date"].isoformat(), claim["id"]])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+def decode_claim_cursor(cursor: str) -> Dict[str, Any]:
+    """Turn a cursor back into the keyset filter for the next page"""
+    try:
+        submitted_date, claim_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        submitted_date = datetime.fromisoformat(submitted_date)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"$or": [
+        {"submitted_date": {"$lt": submitted_date}},
+        {"submitted_date": submitted_date, "id": {"$lt": claim_id}}
+    ]}
+
+async def stream_claims_ndjson(cursor, model=ForestClaim):
+    """Yield one JSON line per claim as the Motor cursor produces them"""
+    async for claim_data in cursor:
+        try:
+            yield load_row(model, claim_data).model_dump_json() + "\n"
+        except Exception as e:
+            print(f"Error converting claim data: {e}")
+
 @api_router.get("/claims", response_model=List[ForestClaim])
-async def get_forest_claims(status: Optional[str] = None, village_id: Optional[str] = None):
+async def get_forest_claims(
+    status: Optional[str] = None,
+    village_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    after: Optional[str] = None,
+    stream: bool = False,
+    fields: Optional[str] = None,
+    bbox: Optional[str] = None,
+    near: Optional[str] = None,
+    radius: float = Query(10000, gt=0, description="Search radius in metres for near=")
+):
+    """List claims a page at a time; the next page's cursor is returned in X-Next-Cursor"""
+    # id and submitted_date are always projected because the cursor is built from them
+    selected = parse_fields(fields, ForestClaim, always=("id", "submitted_date"))
+    projection = projection_for(selected) if selected else None
+    model = slim_model(ForestClaim, selected) if selected else ForestClaim
+    query = {}
+    if status:
+        query["status"] = status
+    if village_id:
+        query["village_id"] = village_id
+    if after:
+        query.update(decode_claim_cursor(after))
+    location = spatial_filter(bbox, near, radius)
+    if location:
+        query["coordinates"] = location
+    
     try:
-        query = {}
-        if status:
-            query["status"] = status
-        if village_id:
-            query["village_id"] = village_id
-        claims = await db.forest_claims.find(query).to_list(1000)
+        if stream:
+            # NDJSON streams every matching claim unless the caller asks for a page
+            cursor = db.forest_claims.find(query, projection).sort(CLAIM_SORT)
+            if limit:
+                cursor = cursor.limit(limit)
+            return StreamingResponse(stream_claims_ndjson(cursor, model), media_type="application/x-ndjson")
         
-        # Remove MongoDB _id field and convert to Pydantic models
-        result = []
-        for claim_data in claims:
-            claim_data.pop('_id', None)  # Remove _id field
-            try:
-                claim = ForestClaim(**claim_data)
-                result.append(claim)
-            except Exception as e:
-                print(f"Error converting claim data: {e}")
-                print(f"Claim data: {claim_data}")
-                continue
+        page_size = limit or 1000
+        # Fetch one extra row to know whether another page exists
+        claims = await db.forest_claims.find(query, projection).sort(CLAIM_SORT).limit(page_size + 1).to_list(page_size + 1)
+        headers = {}
+        if len(claims) > page_size:
+            claims = claims[:page_size]
+            headers["X-Next-Cursor"] = encode_claim_cursor(claims[-1])
         
-        return result
+        return rows_response(model, claims, headers)
     except Exception as e:
         print(f"Database connection failed: {e}")
         raise HTTPException(status_code=503, detail="Database unavailable")
 
-@api_router.post("/claims", response_model=ForestClaim)
-async def create_forest_claim(claim_data: ClaimCreate):
-    claim = ForestClaim(
+async def village_location(village_id: str) -> Dict[str, Any]:
+    """State and district of a village, denormalized onto its claims"""
+    village = await db.villages.find_one({"id": village_id}, {"_id": 0, "state": 1, "district": 1})
+    return village or {}
+
+def new_claim(claim_data: ClaimCreate, location: Dict[str, Any]) -> ForestClaim:
+    """A freshly submitted claim with its generated id and claim number"""
+    now = datetime.now(timezone.utc)
+    return ForestClaim(
         **claim_data.dict(),
+        **location,
         id=str(uuid.uuid4()),
+        claim_number=f"FRA-{now:%Y%m%d}-{uuid.uuid4().hex[:8].upper()}",
         status="pending",
-        submitted_date=datetime.now(timezone.utc),
-        last_updated=datetime.now(timezone.utc),
+        submitted_date=now,
+        last_updated=now,
         coordinates={"type": "Point", "coordinates": [0.0, 0.0]}
     )
+
+@api_router.post("/claims", response_model=ForestClaim)
+async def create_forest_claim(claim_data: ClaimCreate):
+    location = await village_location(claim_data.village_id)
+    claim = new_claim(claim_data, location)
     await db.forest_claims.insert_one(claim.dict())
+    await record_status_change(claim.dict(), None, claim.status)
+    dashboard_stats_cache.invalidate()
     return claim
 
+def parse_claim_batch(body: bytes, content_type: str) -> List[Any]:
+    """Rows of a JSON array or NDJSON body; NDJSON lines that fail to parse come back as exceptions"""
+    if "ndjson" in content_type or "jsonl" in content_type:
+        rows = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as e:
+                rows.append(e)
+        return rows
+    
+    try:
+        rows = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of claims")
+    return rows
+
+@api_router.post("/claims/bulk")
+async def create_forest_claims_bulk(request: Request):
+    """Create many claims from a JSON array or NDJSON body; rows that fail are reported by index"""
+    if not mongodb_available or db is None:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    
+    rows = parse_claim_batch(await request.body(), request.headers.get("content-type", ""))
+    if len(rows) > CLAIM_BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {CLAIM_BULK_MAX_ROWS} claims per request")
+    
+    errors = []
+    valid = []
+    claim_adapter = TypeAdapter(ClaimCreate)
+    for index, row in enumerate(rows):
+        if isinstance(row, Exception):
+            errors.append({"row": index, "error": f"Invalid JSON: {row}"})
+            continue
+        try:
+            valid.append((index, claim_adapter.validate_python(row)))
+        except ValidationError as e:
+            errors.append({"row": index, "error": e.errors(include_url=False, include_context=False, include_input=False)})
+    
+    # One lookup for the state/district of every village in the batch
+    village_ids = list({claim_data.village_id for _, claim_data in valid})
+    locations = {}
+    async for village in db.villages.find({"id": {"$in": village_ids}}, {"_id": 0, "id": 1, "state": 1, "district": 1}):
+        locations[village.pop("id")] = village
+    claims = [(index, new_claim(claim_data, locations.get(claim_data.village_id, {}))) for index, claim_data in valid]
+    
+    inserted = []
+    for start in range(0, len(claims), CLAIM_BULK_CHUNK):
+        chunk = claims[start:start + CLAIM_BULK_CHUNK]
+        failed = {}
+        try:
+            await db.forest_claims.bulk_write([InsertOne(claim.dict()) for _, claim in chunk], ordered=False)
+        except BulkWriteError as e:
+            # Unordered writes carry on past a failed row; each error names its position in the chunk
+            failed = {error["index"]: error.get("errmsg", "Write failed") for error in e.details.get("writeErrors", [])}
+        for position, (index, claim) in enumerate(chunk):
+            if position in failed:
+                errors.append({"row": index, "error": failed[position]})
+            else:
+                inserted.append((index, claim))
+    
+    if inserted:
+        pending = {}
+        for _, claim in inserted:
+            key = (claim.state, claim.district, claim.status)
+            pending[key] = pending.get(key, 0) + 1
+        await bump_claim_rollups([(state, district, status, count) for (state, district, status), count in pending.items()])
+        dashboard_stats_cache.invalidate()
+    
+    errors.sort(key=lambda error: error["row"])
+    return {
+        "received": len(rows),
+        "inserted": len(inserted),
+        "failed": len(errors),
+        "claims": [{"row": index, "id": claim.id, "claim_number": claim.claim_number} for index, claim in inserted],
+        "errors": errors
+    }
+
 @api_router.put("/claims/{claim_id}", response_model=ForestClaim)
 async def update_forest_claim(claim_id: str, updates: ClaimUpdate):
     update_data = {k: v for k, v in updates.dict().items() if v is not None}
     update_data["last_updated"] = datetime.now(timezone.utc)
     
+    # Take the document as it was before the update so the rollups see the true old status
     result = await db.forest_claims.find_one_and_update(
         {"id": claim_id},
         {"$set": update_data},
-        return_document=True
+        return_document=ReturnDocument.BEFORE
     )
     
     if not result:
         raise HTTPException(status_code=404, detail="Claim not found")
     
+    old_status = result.get("status")
+    result.update(update_data)
+    if "status" in update_data:
+        await record_status_change(result, old_status, update_data["status"])
+        dashboard_stats_cache.invalidate()
+    
     result.pop('_id', None)
     return ForestClaim(**result)
 
@@ -383,22 +1049,93 @@ async def get_forest_claim(claim_id: str):
         if not claim:
             raise HTTPException(status_code=404, detail="Claim not found")
         
-        claim.pop('_id', None)
-        return ForestClaim(**claim)
+        return row_response(ForestClaim, claim)
     except HTTPException:
         raise
     except Exception as e:
         print(f"Database error: {e}")
         raise HTTPException(status_code=503, detail="Database unavailable")
 
+# Server-side clustering: villages are grouped into a lat/lng grid sized from the zoom level
+CLUSTER_CELLS_PER_TILE = 4
+# Same ceiling as the plain village list; above this zoom a cluster request needs bbox= or near=
+CLUSTER_MAX_CELLS = 1000
+CLUSTER_MAX_ZOOM_WITHOUT_AREA = 6
+
+async def cluster_villages(query: Dict[str, Any], zoom: int) -> List[Dict[str, Any]]:
+    """One feature per occupied grid cell (largest CLUSTER_MAX_CELLS), with count, totals and centroid"""
+    cell_size = 360.0 / (2 ** zoom) / CLUSTER_CELLS_PER_TILE
+    pipeline = [
+        {"$match": query},
+        # Villages without a point would all land in one cell with null coordinates
+        {"$match": {
+            "coordinates.coordinates.0": {"$type": "number"},
+            "coordinates.coordinates.1": {"$type": "number"}
+        }},
+        {"$project": {
+            "population": 1,
+            "forest_area": 1,
+            "lng": {"$arrayElemAt": ["$coordinates.coordinates", 0]},
+            "lat": {"$arrayElemAt": ["$coordinates.coordinates", 1]}
+        }},
+        {"$group": {
+            "_id": {
+                "x": {"$floor": {"$divide": ["$lng", cell_size]}},
+                "y": {"$floor": {"$divide": ["$lat", cell_size]}}
+            },
+            "count": {"$sum": 1},
+            "population": {"$sum": "$population"},
+            "forest_area": {"$sum": "$forest_area"},
+            "lng": {"$avg": "$lng"},
+            "lat": {"$avg": "$lat"}
+        }},
+        {"$sort": {"count": -1}},
+        {"$limit": CLUSTER_MAX_CELLS}
+    ]
+    
+    features = []
+    async for cell in db.villages.aggregate(pipeline):
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [cell["lng"], cell["lat"]]},
+            "properties": {
+                "cluster": True,
+                "count": cell["count"],
+                "population": cell["population"],
+                "forest_area": cell["forest_area"]
+            }
+        })
+    return features
+
 @api_router.get("/map/villages", response_model=FeatureCollection)
-async def get_villages_geojson(state: Optional[str] = None, district: Optional[str] = None):
+async def get_villages_geojson(
+    state: Optional[str] = None,
+    district: Optional[str] = None,
+    bbox: Optional[str] = None,
+    near: Optional[str] = None,
+    radius: float = Query(10000, gt=0, description="Search radius in metres for near="),
+    cluster: bool = False,
+    zoom: int = Query(5, ge=0, le=22, description="Map zoom used to size clusters when cluster=true")
+):
+    # Nearest villages first, so the 1000 cap keeps the ones closest to the point
+    # ($nearSphere is not allowed in an aggregation $match, so clusters use $geoWithin)
+    location = spatial_filter(bbox, near, radius, nearest_first=not cluster)
+    if cluster and location is None and zoom > CLUSTER_MAX_ZOOM_WITHOUT_AREA:
+        raise HTTPException(
+            status_code=400,
+            detail=f"cluster=true above zoom {CLUSTER_MAX_ZOOM_WITHOUT_AREA} needs bbox or near"
+        )
     try:
         query = {}
         if state:
             query["state"] = state
         if district:
             query["district"] = district
+        if location:
+            query["coordinates"] = location
+        
+        if cluster:
+            return {"type": "FeatureCollection", "features": await cluster_villages(query, zoom)}
         
         villages = await db.villages.find(query).to_list(1000)
         features = []
@@ -432,62 +1169,330 @@ async def get_villages_geojson(state: Optional[str] = None, district: Optional[s
         print(f"Database connection failed: {e}")
         raise HTTPException(status_code=503, detail="Database unavailable")
 
+# Village map tiles (slippy map z/x/y scheme)
+VILLAGE_FEATURE_FIELDS = [
+    "id", "name", "state", "district", "tehsil", "village_code",
+    "population", "tribal_population", "total_area", "forest_area"
+]
+EMPTY_TILE = b'{"type":"FeatureCollection","features":[]}'
+
+def village_feature(village: Dict[str, Any]) -> Dict[str, Any]:
+    """GeoJSON feature for a stored village document"""
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": village["coordinates"]["coordinates"]},
+        "properties": {name: village.get(name) for name in VILLAGE_FEATURE_FIELDS}
+    }
+
+def tile_bounds(z: int, x: int, y: int) -> tuple:
+    """(min_lng, min_lat, max_lng, max_lat) of a tile (Web Mercator)"""
+    n = 2 ** z
+    def lat(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+    return x / n * 360.0 - 180.0, lat(y + 1), (x + 1) / n * 360.0 - 180.0, lat(y)
+
+def tile_filter(z: int, x: int, y: int) -> Optional[Dict[str, Any]]:
+    """$geoWithin condition on coordinates for one tile (None at zoom 0, the whole map)"""
+    if z == 0:
+        return None
+    return {"$geoWithin": {"$geometry": box_polygon(*tile_bounds(z, x, y))}}
+
+async def build_village_tile(query: Dict[str, Any], z: int) -> bytes:
+    """Serialized tile: clusters below MAP_TILE_CLUSTER_BELOW_ZOOM, capped villages above"""
+    if z < MAP_TILE_CLUSTER_BELOW_ZOOM:
+        features = await cluster_villages(query, z)
+    else:
+        projection = {name: 1 for name in VILLAGE_FEATURE_FIELDS + ["coordinates"]}
+        projection["_id"] = 0
+        features = [
+            village_feature(village)
+            async for village in db.villages.find(query, projection).limit(MAP_TILE_MAX_FEATURES)
+        ]
+    if not features:
+        return EMPTY_TILE
+    return json.dumps({"type": "FeatureCollection", "features": features}, default=str).encode("utf-8")
+
+@api_router.get("/map/villages/{z}/{x}/{y}")
+async def get_village_tile(
+    z: int = Path(..., ge=0, le=22),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    state: Optional[str] = None,
+    district: Optional[str] = None
+):
+    """Village features inside one map tile, queried by the tile's bounds and cached per tile"""
+    if x >= 2 ** z or y >= 2 ** z:
+        raise HTTPException(status_code=400, detail="Tile coordinates out of range for zoom level")
+    
+    key = (state, district, z, x, y)
+    try:
+        tile = village_tile_cache.get(key)
+        if tile is None:
+            async with village_tile_cache.key_lock(key):
+                tile = village_tile_cache.get(key)
+                if tile is None:
+                    generation = village_tile_cache.generation
+                    query = {}
+                    if state:
+                        query["state"] = state
+                    if district:
+                        query["district"] = district
+                    bounds = tile_filter(z, x, y)
+                    if bounds:
+                        query["coordinates"] = bounds
+                    tile = await build_village_tile(query, z)
+                    village_tile_cache.set(key, tile, generation)
+        
+        return Response(
+            content=tile,
+            media_type="application/geo+json",
+            headers={"Cache-Control": "public, max-age=60"}
+        )
+    except Exception as e:
+        print(f"Database connection failed: {e}")
+        raise HTTPException(status_code=503, detail="Database unavailable")
+
+# Data validation records live in data_validations, or in memory when offline
+async def store_validation(validation_doc: Dict[str, Any]):
+    if mongodb_available and db is not None:
+        await db.data_validations.insert_one(validation_doc)
+    else:
+        # In offline mode, store in memory for demo purposes
+        offline_validations.append(validation_doc)
+
+async def update_validation(validation_id: str, fields: Dict[str, Any]):
+    if mongodb_available and db is not None:
+        await db.data_validations.update_one({"id": validation_id}, {"$set": fields})
+    else:
+        for validation in offline_validations:
+            if validation["id"] == validation_id:
+                validation.update(fields)
+
+async def find_validation(validation_id: str) -> Optional[Dict[str, Any]]:
+    if mongodb_available and db is not None:
+        return await db.data_validations.find_one({"id": validation_id}, {"_id": 0})
+    return next((dict(v) for v in offline_validations if v["id"] == validation_id), None)
+
+def validation_summary(validation_result: Dict, record_count: int) -> Dict[str, Any]:
+    return {
+        "confidence_score": validation_result.get('confidence_score', 0.0),
+        "issues_found": [issue.get('check_type', str(issue)) for issue in validation_result.get('issues', [])],
+        "record_count": record_count
+    }
+
+# Re-uploads of an identical file reuse the earlier result instead of being validated again
+def validation_cache_key(digest: str, dataset_type: str, version: str) -> str:
+    return f"{digest}:{dataset_type}:{version}"
+
+async def cached_validation(digest: str, dataset_type: str, version: str) -> Optional[tuple]:
+    """(validation_result, record_count) from an earlier upload with the same content, if any"""
+    key = validation_cache_key(digest, dataset_type, version)
+    cached = validation_result_cache.get(key)
+    if cached is None and mongodb_available and db is not None:
+        try:
+            entry = await db.validation_cache.find_one({"_id": key})
+        except Exception as e:
+            print(f"⚠️  Validation cache lookup failed: {e}")
+            entry = None
+        if entry:
+            cached = (entry["result"], entry["record_count"])
+            validation_result_cache.set(key, cached)
+    return cached
+
+async def cache_validation(digest: str, dataset_type: str, version: str, validation_result: Dict, record_count: int):
+    key = validation_cache_key(digest, dataset_type, version)
+    validation_result_cache.set(key, (validation_result, record_count))
+    if mongodb_available and db is not None:
+        try:
+            await db.validation_cache.replace_one({"_id": key}, {
+                "sha256": digest,
+                "dataset_type": dataset_type,
+                "validator_version": version,
+                "result": validation_result,
+                "record_count": record_count,
+                "cached_at": datetime.now(timezone.utc)
+            }, upsert=True)
+        except Exception as e:
+            print(f"⚠️  Could not store validation cache entry: {e}")
+
+async def run_validation_job(validation_id: str, path: str, digest: str, dataset_type: str):
+    """Validate a stored upload in the worker pool and record the outcome on its validation record"""
+    global validations_in_flight
+    progress = get_validation_progress()
+    try:
+        validation_result, record_count = await run_in_validation_pool(
+            validate_csv_job, path, dataset_type, validation_id, progress
+        )
+        await cache_validation(
+            digest, dataset_type, validator_version(dataset_type, chunked=True), validation_result, record_count
+        )
+        await update_validation(validation_id, {
+            **validation_summary(validation_result, record_count),
+            "job_status": "complete",
+            "rows_processed": record_count,
+            "validated_at": datetime.now(timezone.utc).isoformat()
+        })
+    except Exception as e:
+        print(f"❌ Validation job {validation_id} failed: {e}")
+        await update_validation(validation_id, {"job_status": "failed", "error": str(e)})
+    finally:
+        progress.pop(validation_id, None)
+        validations_in_flight -= 1
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
 # Data Validation Endpoints
 @api_router.post("/data/validate-csv")
-async def validate_csv_data(file: UploadFile = File(...), dataset_type: str = Form(...)):
+async def validate_csv_data(
+    file: UploadFile = File(...),
+    dataset_type: str = Form(...),
+    streaming: bool = Form(False),
+    background: bool = Form(False)
+):
     """Upload and validate CSV data for quality issues and potential fake data"""
+    global validations_in_flight
+    # Running plus queued validations are capped; beyond that clients are asked to retry
+    if validations_in_flight >= CSV_VALIDATION_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=429,
+            detail="Validation queue is full, please retry shortly",
+            headers={"Retry-After": "10"}
+        )
+    
+    validations_in_flight += 1
+    job_started = False
+    path = None
     try:
-        # Read uploaded CSV
-        contents = await file.read()
-        df = pd.read_csv(io.StringIO(contents.decode('utf-8')))
-        
-        # Import validation logic
-        try:
-            sys.path.append(os.path.join(os.path.dirname(__file__), '../../ai-service/data_pipeline'))
-            from data_validator import DataValidator
-            
-            # Validate the data
-            validator = DataValidator()
-            validation_result = validator.validate_dataset(df, dataset_type)
-        except ImportError:
-            # Fallback to simple validation
-            validation_result = simple_data_validation(df, dataset_type)
-        
         # Generate unique ID for this validation
         validation_id = str(uuid.uuid4())
+        
+        # The upload is hashed as it is read so identical files can be answered from the cache
+        chunked = background or streaming or (file.size or 0) > CSV_STREAMING_THRESHOLD
+        if background:
+            path, digest = await save_upload_to_disk(file, VALIDATION_UPLOAD_DIR)
+        elif chunked:
+            # Large uploads are spooled to disk and validated in chunks
+            path, digest = await save_upload_to_disk(file)
+        else:
+            # Read uploaded CSV
+            contents = await file.read()
+            digest = hashlib.sha256(contents).hexdigest()
+        
+        version = validator_version(dataset_type, chunked)
+        cached = await cached_validation(digest, dataset_type, version)
+        if cached is None and background:
+            # Store the upload and return at once; progress is polled on /data/validations/{id}
+            await store_validation({
+                "id": validation_id,
+                "dataset_name": file.filename,
+                "validation_status": "pending",
+                "job_status": "queued",
+                "rows_processed": 0,
+                "confidence_score": 0.0,
+                "issues_found": [],
+                "record_count": 0,
+                "validated_at": datetime.now(timezone.utc).isoformat(),
+                "validated_by": None,
+                "notes": None
+            })
+            start_background_task(run_validation_job(validation_id, path, digest, dataset_type))
+            job_started = True
+            return Response(
+                content=json.dumps({
+                    "id": validation_id,
+                    "validation_id": validation_id,
+                    "status": "queued",
+                    "status_url": f"/api/data/validations/{validation_id}"
+                }),
+                status_code=202,
+                media_type="application/json"
+            )
+        
+        if cached is not None:
+            validation_result, record_count = cached
+        else:
+            if path:
+                validation_result, record_count = await run_in_validation_pool(
+                    validate_csv_file, path, dataset_type
+                )
+            else:
+                validation_result, record_count = await run_in_validation_pool(
+                    validate_csv_bytes, contents, dataset_type
+                )
+            await cache_validation(digest, dataset_type, version, validation_result, record_count)
+        
         validation_doc = {
             "id": validation_id,
             "dataset_name": file.filename,
             "validation_status": "pending",
-            "confidence_score": validation_result.get('confidence_score', 0.0),
-            "issues_found": [issue.get('check_type', str(issue)) for issue in validation_result.get('issues', [])],
-            "record_count": len(df),
+            **validation_summary(validation_result, record_count),
             "validated_at": datetime.now(timezone.utc).isoformat(),
             "validated_by": None,
             "notes": None
         }
         
         # Store in database if available, otherwise keep in memory for demo
-        if mongodb_available and db is not None:
-            await db.data_validations.insert_one(validation_doc)
-        else:
-            # In offline mode, store in memory for demo purposes
-            offline_validations.append(validation_doc)
+        await store_validation(validation_doc)
+        if not mongodb_available:
             print(f"📊 Validation completed for {file.filename} (offline mode)")
         
         return {
             "id": validation_id,
             "validation_id": validation_id,
             "status": "validation_complete",
-            "confidence_score": validation_result.get('confidence_score', 0.0),
+            "confidence_score": validation_doc["confidence_score"],
             "issues_found": validation_doc["issues_found"],
-            "record_count": len(df),
+            "record_count": record_count,
             "validation_status": "pending",
-            "requires_manual_review": validation_result.get('confidence_score', 0.0) < 0.7
+            "requires_manual_review": validation_doc["confidence_score"] < 0.7,
+            "cached": cached is not None
         }
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Validation failed: {str(e)}")
+    finally:
+        # A started job releases its slot and removes its upload when it finishes
+        if not job_started:
+            validations_in_flight -= 1
+            if path:
+                os.remove(path)
+
+async def fail_orphaned_validations():
+    """Background jobs do not survive a restart: fail their records and remove their uploads"""
+    if mongodb_available and db is not None:
+        try:
+            result = await db.data_validations.update_many(
+                {"job_status": {"$in": ["queued", "running"]}},
+                {"$set": {"job_status": "failed", "error": "Interrupted by a server restart, please upload again"}}
+            )
+            if result.modified_count:
+                print(f"⚠️  Marked {result.modified_count} interrupted validation jobs as failed")
+        except Exception as e:
+            print(f"⚠️  Could not clean up interrupted validation jobs: {e}")
+    # Nothing is running yet, so anything left in the job directory belongs to a dead job
+    if os.path.isdir(VALIDATION_UPLOAD_DIR):
+        for name in os.listdir(VALIDATION_UPLOAD_DIR):
+            try:
+                os.remove(os.path.join(VALIDATION_UPLOAD_DIR, name))
+            except OSError as e:
+                print(f"⚠️  Could not remove {name}: {e}")
+
+@api_router.get("/data/validations/{validation_id}")
+async def get_data_validation(validation_id: str):
+    """Get one validation, including live progress while a background job is running"""
+    try:
+        validation = await find_validation(validation_id)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    
+    if not validation:
+        raise HTTPException(status_code=404, detail="Validation not found")
+    
+    if validation.get("job_status") in ("queued", "running") and validation_progress is not None:
+        validation.update(validation_progress.get(validation_id, {}))
+    return validation
 
 @api_router.get("/data/validations")
 async def get_data_validations():
@@ -535,43 +1540,53 @@ async def update_validation_status(validation_id: str, status: str = Form(...),
         raise HTTPException(status_code=400, detail=f"Update failed: {str(e)}")
 
 # Enhanced Claim Management for FRA
+CLAIM_STATUSES = ["pending", "approved", "rejected", "disputed", "verified", "under_review"]
+
+def status_update_fields(new_status: str, officer: Optional[str], now: datetime) -> Dict[str, Any]:
+    update_data = {
+        "status": new_status,
+        "last_updated": now
+    }
+    
+    if officer:
+        update_data["assigned_officer"] = officer
+        
+    # Handle status-specific updates
+    if new_status == "approved":
+        update_data["granted_date"] = now
+    elif new_status == "verified":
+        update_data["field_verification_date"] = now
+        update_data["verification_status"] = "completed"
+    return update_data
+
 @api_router.put("/claims/{claim_id}/status")
 async def update_claim_status(claim_id: str, new_status: str = Form(...), notes: str = Form(None), officer: str = Form(None)):
     """Update claim status with proper FRA workflow"""
-    valid_statuses = ["pending", "approved", "rejected", "disputed", "verified", "under_review"]
-    
-    if new_status not in valid_statuses:
-        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
+    if new_status not in CLAIM_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {CLAIM_STATUSES}")
     
     try:
-        update_data = {
-            "status": new_status,
-            "last_updated": datetime.now(timezone.utc)
-        }
+        update_data = status_update_fields(new_status, officer, datetime.now(timezone.utc))
         
-        if officer:
-            update_data["assigned_officer"] = officer
-            
-        # Handle status-specific updates
-        if new_status == "approved":
-            update_data["granted_date"] = datetime.now(timezone.utc)
-        elif new_status == "verified":
-            update_data["field_verification_date"] = datetime.now(timezone.utc)
-            update_data["verification_status"] = "completed"
-            
+        # Take the document as it was before the update to capture the true old status
         result = await db.forest_claims.find_one_and_update(
             {"id": claim_id},
             {"$set": update_data},
-            return_document=True
+            return_document=ReturnDocument.BEFORE
         )
         
         if not result:
             raise HTTPException(status_code=404, detail="Claim not found")
         
+        old_status = result.get("status")
+        result.update(update_data)
+        await record_status_change(result, old_status, new_status)
+        dashboard_stats_cache.invalidate()
+        
         # Log status change
         status_log = {
             "claim_id": claim_id,
-            "old_status": result.get("status", "unknown"),
+            "old_status": old_status or "unknown",
             "new_status": new_status,
             "changed_by": officer or "system",
             "changed_at": datetime.now(timezone.utc),
@@ -585,6 +1600,132 @@ async def update_claim_status(claim_id: str, new_status: str = Form(...), notes:
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Status update failed: {str(e)}")
 
+transaction_support = None
+
+async def transactions_supported() -> bool:
+    """Multi-document transactions need a replica set or sharded cluster"""
+    global transaction_support
+    if transaction_support is None:
+        try:
+            hello = await db.command("hello")
+            transaction_support = "setName" in hello or hello.get("msg") == "isdbgrid"
+        except Exception:
+            transaction_support = False
+    return transaction_support
+
+async def apply_status_changes(requested: Dict[str, tuple], officer: Optional[str], session=None) -> tuple:
+    """Write a batch of status changes and their log entries; returns (applied, errors)"""
+    now = datetime.now(timezone.utc)
+    errors = []
+    prior = {}
+    async for claim in db.forest_claims.find(
+        {"id": {"$in": list(requested)}},
+        {"_id": 0, "id": 1, "status": 1, "state": 1, "district": 1},
+        session=session
+    ):
+        prior[claim["id"]] = claim
+    
+    updates = []
+    applied = []
+    for claim_id, (index, change) in requested.items():
+        claim = prior.get(claim_id)
+        if claim is None:
+            errors.append({"row": index, "claim_id": claim_id, "error": "Claim not found"})
+        elif claim.get("status") == change.new_status:
+            errors.append({"row": index, "claim_id": claim_id, "error": f"Claim is already {change.new_status}"})
+        else:
+            # Matching on the status just read leaves alone any claim changed in the meantime
+            updates.append(UpdateOne(
+                {"id": claim_id, "status": claim.get("status")},
+                {"$set": status_update_fields(change.new_status, officer, now)}
+            ))
+            applied.append((index, change, claim))
+    if not updates:
+        return [], errors
+    
+    result = await db.forest_claims.bulk_write(updates, ordered=False, session=session)
+    if result.matched_count < len(updates):
+        # The claims actually written are the ones carrying this batch's timestamp
+        written = set(await db.forest_claims.distinct(
+            "id", {"id": {"$in": [change.claim_id for _, change, _ in applied]}, "last_updated": now}, session=session
+        ))
+        for index, change, _ in applied:
+            if change.claim_id not in written:
+                errors.append({"row": index, "claim_id": change.claim_id, "error": "Claim status changed concurrently, please retry"})
+        applied = [item for item in applied if item[1].claim_id in written]
+    
+    if applied:
+        await db.claim_status_log.insert_many([
+            {
+                "claim_id": change.claim_id,
+                "old_status": claim.get("status") or "unknown",
+                "new_status": change.new_status,
+                "changed_by": officer or "system",
+                "changed_at": now,
+                "notes": change.notes
+            }
+            for _, change, claim in applied
+        ], session=session)
+    return applied, errors
+
+@api_router.post("/claims/status/bulk")
+async def bulk_update_claim_status(payload: BulkStatusUpdate):
+    """Apply many status changes at once, e.g. the decisions of an SDLC/DLC meeting"""
+    if not mongodb_available or db is None:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    if len(payload.changes) > CLAIM_BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {CLAIM_BULK_MAX_ROWS} changes per request")
+    
+    errors = []
+    requested = {}
+    for index, change in enumerate(payload.changes):
+        if change.new_status not in CLAIM_STATUSES:
+            errors.append({"row": index, "claim_id": change.claim_id, "error": f"Invalid status. Must be one of: {CLAIM_STATUSES}"})
+        elif change.claim_id in requested:
+            errors.append({"row": index, "claim_id": change.claim_id, "error": "Claim appears more than once in this batch"})
+        else:
+            requested[change.claim_id] = (index, change)
+    
+    transactional = bool(requested) and await transactions_supported()
+    try:
+        if transactional:
+            # Claim updates and their log entries commit together; with_transaction retries the
+            # whole batch on TransientTransactionError and write conflicts
+            async def apply_in_transaction(session):
+                return await apply_status_changes(requested, payload.officer, session)
+            
+            async with await client.start_session() as session:
+                applied, write_errors = await session.with_transaction(apply_in_transaction)
+        else:
+            applied, write_errors = await apply_status_changes(requested, payload.officer)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Bulk status update failed: {str(e)}")
+    errors.extend(write_errors)
+    
+    if applied:
+        changes = {}
+        for _, change, claim in applied:
+            for status, delta in ((change.new_status, 1), (claim.get("status"), -1)):
+                if status is None:
+                    continue
+                key = (claim.get("state"), claim.get("district"), status)
+                changes[key] = changes.get(key, 0) + delta
+        await bump_claim_rollups([(state, district, status, delta) for (state, district, status), delta in changes.items()])
+        dashboard_stats_cache.invalidate()
+    
+    errors.sort(key=lambda error: error["row"])
+    return {
+        "requested": len(payload.changes),
+        "updated": len(applied),
+        "failed": len(errors),
+        "transactional": transactional,
+        "claims": [
+            {"row": index, "claim_id": change.claim_id, "old_status": claim.get("status"), "new_status": change.new_status}
+            for index, change, claim in sorted(applied, key=lambda item: item[0])
+        ],
+        "errors": errors
+    }
+
 @api_router.get("/claims/{claim_id}/history")
 async def get_claim_history(claim_id: str):
     """Get status change history for a claim"""
@@ -639,13 +1780,7 @@ async def get_village_assets(village_id: str):
     """Get AI-detected assets for a village from satellite imagery"""
     try:
         assets = await db.satellite_assets.find({"village_id": village_id}).to_list(1000)
-        
-        result = []
-        for asset in assets:
-            asset.pop('_id', None)
-            result.append(SatelliteAsset(**asset))
-            
-        return result
+        return rows_response(SatelliteAsset, assets)
         
     except Exception as e:
         raise HTTPException(status_code=503, detail="Database unavailable")
@@ -656,6 +1791,11 @@ async def add_satellite_asset(village_id: str, asset: SatelliteAsset):
     try:
         asset.village_id = village_id
         await db.satellite_assets.insert_one(asset.dict())
+        # The background worker recomputes the village's recommendation
+        await db.ds_recommendations.update_one(
+            {"village_id": village_id},
+            {"$set": {"dirty": True}, "$inc": {"assets_version": 1}}
+        )
         return asset
         
     except Exception as e:
@@ -667,18 +1807,73 @@ async def get_village_schemes(village_id: str):
     """Get CSS schemes applicable to a village"""
     try:
         schemes = await db.css_schemes.find({"village_id": village_id}).to_list(1000)
-        
-        result = []
-        for scheme in schemes:
-            scheme.pop('_id', None)
-            result.append(CSSScheme(**scheme))
-            
-        return result
+        return rows_response(CSSScheme, schemes)
         
     except Exception as e:
         raise HTTPException(status_code=503, detail="Database unavailable")
 
 # Decision Support System
+DSS_ASSET_TYPES = ["water_body", "agricultural_land"]
+
+async def dss_asset_counts(village_ids: List[str]) -> Dict[str, Dict[str, int]]:
+    """Asset counts per village and type from a single $group, without loading the assets"""
+    pipeline = [
+        {"$match": {"village_id": {"$in": village_ids}, "asset_type": {"$in": DSS_ASSET_TYPES}}},
+        {"$group": {"_id": {"village_id": "$village_id", "asset_type": "$asset_type"}, "count": {"$sum": 1}}}
+    ]
+    counts = {village_id: {} for village_id in village_ids}
+    async for group in db.satellite_assets.aggregate(pipeline):
+        counts[group["_id"]["village_id"]][group["_id"]["asset_type"]] = group["count"]
+    return counts
+
+def build_recommendation(village_id: str, asset_counts: Dict[str, int]) -> DSRecommendation:
+    """Simple rule-based recommendation logic"""
+    recommended_schemes = []
+    priority_score = 0.5
+    reasoning = {}
+    water_bodies = asset_counts.get("water_body", 0)
+    agricultural_land = asset_counts.get("agricultural_land", 0)
+    
+    # Check water infrastructure
+    if water_bodies < 2:  # Low water infrastructure
+        recommended_schemes.append("JAL_JEEVAN_MISSION")
+        priority_score += 0.2
+        reasoning["water"] = "Low water body count detected"
+    
+    # Check agricultural land
+    if agricultural_land:
+        recommended_schemes.append("PM_KISAN")
+        reasoning["agriculture"] = "Agricultural land detected"
+    
+    # Always consider MGNREGA for employment
+    recommended_schemes.append("MGNREGA")
+    reasoning["employment"] = "Employment generation needed"
+    
+    return DSRecommendation(
+        village_id=village_id,
+        recommended_schemes=recommended_schemes,
+        priority_score=priority_score,
+        reasoning=reasoning,
+        water_index=water_bodies * 0.1,
+        agricultural_potential=agricultural_land * 0.1
+    )
+
+def recommendation_update(recommendation: DSRecommendation, assets_version: Optional[int] = None) -> UpdateOne:
+    """Store a computed recommendation; with assets_version, only if no asset arrived while computing it"""
+    fields = recommendation.dict()
+    recommendation_id = fields.pop("id")
+    fields.pop("assets_version")
+    fields["dirty"] = False
+    if assets_version is None:
+        return UpdateOne(
+            {"village_id": recommendation.village_id},
+            {"$set": fields, "$setOnInsert": {"id": recommendation_id, "assets_version": 0}},
+            upsert=True
+        )
+    # Rows written before versioning have no assets_version yet
+    version = assets_version if assets_version else {"$in": [0, None]}
+    return UpdateOne({"village_id": recommendation.village_id, "assets_version": version}, {"$set": fields})
+
 @api_router.get("/dss/recommendations/{village_id}")
 async def get_dss_recommendations(village_id: str):
     """Get DSS recommendations for a village"""
@@ -687,92 +1882,319 @@ async def get_dss_recommendations(village_id: str):
         
         if not recommendation:
             # Generate new recommendation based on available data
-            village = await db.villages.find_one({"id": village_id})
+            village = await db.villages.find_one({"id": village_id}, {"_id": 0, "id": 1})
             if not village:
                 raise HTTPException(status_code=404, detail="Village not found")
-                
-            # Simple rule-based recommendation logic
-            recommended_schemes = []
-            priority_score = 0.5
-            reasoning = {}
-            
-            # Check water infrastructure
-            water_assets = await db.satellite_assets.find({
-                "village_id": village_id, 
-                "asset_type": "water_body"
-            }).to_list(100)
-            
-            if len(water_assets) < 2:  # Low water infrastructure
-                recommended_schemes.append("JAL_JEEVAN_MISSION")
-                priority_score += 0.2
-                reasoning["water"] = "Low water body count detected"
-            
-            # Check agricultural land
-            agri_assets = await db.satellite_assets.find({
-                "village_id": village_id, 
-                "asset_type": "agricultural_land"
-            }).to_list(100)
-            
-            if agri_assets:
-                recommended_schemes.append("PM_KISAN")
-                reasoning["agriculture"] = "Agricultural land detected"
             
-            # Always consider MGNREGA for employment
-            recommended_schemes.append("MGNREGA")
-            reasoning["employment"] = "Employment generation needed"
-            
-            recommendation_doc = DSRecommendation(
-                village_id=village_id,
-                recommended_schemes=recommended_schemes,
-                priority_score=priority_score,
-                reasoning=reasoning,
-                water_index=len(water_assets) * 0.1,
-                agricultural_potential=len(agri_assets) * 0.1 if agri_assets else 0.0
-            )
-            
-            await db.ds_recommendations.insert_one(recommendation_doc.dict())
+            counts = await dss_asset_counts([village_id])
+            recommendation_doc = build_recommendation(village_id, counts[village_id])
+            await db.ds_recommendations.bulk_write([recommendation_update(recommendation_doc)])
             recommendation = recommendation_doc.dict()
         else:
             recommendation.pop('_id', None)
             
         return DSRecommendation(**recommendation)
         
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"DSS error: {str(e)}")
+
+@api_router.post("/dss/recommendations/batch")
+async def generate_district_recommendations(state: str = Query(...), district: str = Query(...)):
+    """(Re)generate DSS recommendations for every village in a district"""
+    try:
+        village_ids = await db.villages.distinct("id", {"state": state, "district": district})
+        if not village_ids:
+            raise HTTPException(status_code=404, detail="No villages found for this district")
+        
+        versions = {}
+        async for existing in db.ds_recommendations.find({"village_id": {"$in": village_ids}}, {"_id": 0, "village_id": 1, "assets_version": 1}):
+            versions[existing["village_id"]] = existing.get("assets_version", 0)
+        
+        # One pass over satellite_assets for the whole district
+        counts = await dss_asset_counts(village_ids)
+        recommendations = [build_recommendation(village_id, counts[village_id]) for village_id in village_ids]
+        writes = [
+            recommendation_update(recommendation, versions.get(recommendation.village_id))
+            for recommendation in recommendations
+        ]
+        await db.ds_recommendations.bulk_write(writes, ordered=False)
+        
+        return {
+            "state": state,
+            "district": district,
+            "villages": len(village_ids),
+            "recommendations": list_adapter(DSRecommendation).dump_python(recommendations, mode="json")
+        }
+        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=503, detail=f"DSS error: {str(e)}")
 
 # FRA Progress Tracking
+def progress_summary(state_name: str, status_counts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    total_claims = sum(item["count"] for item in status_counts)
+    approved_claims = next((item["count"] for item in status_counts if item["_id"] == "approved"), 0)
+    pending_claims = next((item["count"] for item in status_counts if item["_id"] == "pending"), 0)
+    
+    progress_percentage = (approved_claims / total_claims * 100) if total_claims > 0 else 0
+    
+    return {
+        "state": state_name,
+        "total_claims": total_claims,
+        "approved_claims": approved_claims,
+        "pending_claims": pending_claims,
+        "progress_percentage": progress_percentage,
+        "status_breakdown": status_counts
+    }
+
 @api_router.get("/progress/state/{state_name}")
 async def get_state_progress(state_name: str):
     """Get FRA implementation progress for a state"""
     try:
-        # Count claims by status
-        pipeline = [
-            {"$match": {"village_name": {"$regex": state_name, "$options": "i"}}},
-            {"$group": {
-                "_id": "$status",
-                "count": {"$sum": 1}
-            }}
-        ]
+        # Claim counts by status come from the per-district rollups
+        status_counts = await rollup_status_counts({"state": state_name})
+        breakdown = [{"_id": status, "count": count} for status, count in status_counts.items() if count]
+        return progress_summary(state_name, breakdown)
         
-        status_counts = await db.forest_claims.aggregate(pipeline).to_list(100)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+
+@api_router.get("/progress/states")
+async def get_all_states_progress():
+    """Get FRA implementation progress for every state from the rollups"""
+    try:
+        by_state = {}
+        async for rollup in db.claim_rollups.find({"state": {"$ne": None}, "count": {"$gt": 0}}):
+            counts = by_state.setdefault(rollup["state"], {})
+            counts[rollup["status"]] = counts.get(rollup["status"], 0) + rollup["count"]
         
-        total_claims = sum(item["count"] for item in status_counts)
-        approved_claims = next((item["count"] for item in status_counts if item["_id"] == "approved"), 0)
-        pending_claims = next((item["count"] for item in status_counts if item["_id"] == "pending"), 0)
+        return [
+            progress_summary(state, [{"_id": status, "count": count} for status, count in counts.items()])
+            for state, counts in sorted(by_state.items())
+        ]
         
-        progress_percentage = (approved_claims / total_claims * 100) if total_claims > 0 else 0
+    except Exception as e:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+
+# Database maintenance
+# (collection, keys, options) for every index the routes' query shapes rely on
+API_INDEXES = [
+    ("villages", [("id", 1)], {"unique": True}),
+    ("villages", [("state", 1), ("district", 1)], {}),
+    ("villages", [("coordinates", "2dsphere")], {}),
+    ("forest_claims", [("id", 1)], {"unique": True}),
+    ("forest_claims", [("submitted_date", -1), ("id", -1)], {}),
+    ("forest_claims", [("status", 1), ("submitted_date", -1), ("id", -1)], {}),
+    ("forest_claims", [("village_id", 1), ("submitted_date", -1), ("id", -1)], {}),
+    ("forest_claims", [("state", 1), ("district", 1), ("status", 1)], {}),
+    ("forest_claims", [("coordinates", "2dsphere")], {}),
+    ("claim_status_log", [("claim_id", 1), ("changed_at", -1)], {}),
+    ("claim_rollups", [("state", 1), ("district", 1), ("status", 1)], {"unique": True}),
+    ("satellite_assets", [("village_id", 1), ("asset_type", 1)], {}),
+    ("css_schemes", [("village_id", 1)], {}),
+    ("ds_recommendations", [("village_id", 1)], {"unique": True}),
+    ("ds_recommendations", [("dirty", 1)], {"partialFilterExpression": {"dirty": True}}),
+    ("data_validations", [("id", 1)], {"unique": True}),
+    ("validation_cache", [("cached_at", 1)], {"expireAfterSeconds": VALIDATION_CACHE_TTL}),
+]
+
+async def drop_duplicate_recommendations():
+    """Keep the newest recommendation per village so the unique village_id index can be built"""
+    pipeline = [
+        {"$sort": {"created_at": -1}},
+        {"$group": {"_id": "$village_id", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}}
+    ]
+    stale = []
+    async for group in db.ds_recommendations.aggregate(pipeline, allowDiskUse=True):
+        stale.extend(group["ids"][1:])
+    if stale:
+        result = await db.ds_recommendations.delete_many({"_id": {"$in": stale}})
+        print(f"🧹 Removed {result.deleted_count} duplicate DSS recommendations")
+
+async def ensure_indexes():
+    """Create the indexes the API's query shapes rely on"""
+    try:
+        await drop_duplicate_recommendations()
+    except Exception as e:
+        print(f"❌ Could not remove duplicate DSS recommendations: {e}")
+    for collection, keys, options in API_INDEXES:
+        try:
+            try:
+                await db[collection].create_index(keys, **options)
+            except OperationFailure as e:
+                # IndexOptionsConflict / IndexKeySpecsConflict: an older build of the same key
+                # with different options (e.g. not yet unique); replace it
+                if e.code not in (85, 86):
+                    raise
+                await db[collection].drop_index(keys)
+                await db[collection].create_index(keys, **options)
+        except Exception as e:
+            # Typically duplicate ids blocking a unique index; the other indexes are still built
+            print(f"❌ Could not create index {keys} on {collection}: {e}")
+
+# Canonical query of each read route, as (route, collection, filter, sort)
+ROUTE_QUERIES = [
+    ("GET /villages", "villages", {"state": "Madhya Pradesh", "district": "Mandla"}, None),
+    ("POST /claims (village lookup)", "villages", {"id": "village_id"}, None),
+    ("GET /map/villages?bbox=", "villages", {"coordinates": {"$geoWithin": {"$geometry": {
+        "type": "Polygon", "coordinates": [[[78.0, 22.0], [79.0, 22.0], [79.0, 23.0], [78.0, 23.0], [78.0, 22.0]]]
+    }}}}, None),
+    ("GET /claims", "forest_claims", {}, CLAIM_SORT),
+    ("GET /claims?status=", "forest_claims", {"status": "pending"}, CLAIM_SORT),
+    ("GET /claims?village_id=", "forest_claims", {"village_id": "village_id"}, CLAIM_SORT),
+    ("GET /claims/{claim_id}", "forest_claims", {"id": "claim_id"}, None),
+    ("GET /claims/{claim_id}/history", "claim_status_log", {"claim_id": "claim_id"}, [("changed_at", -1)]),
+    ("GET /progress/state/{state_name}", "claim_rollups", {"state": "Madhya Pradesh"}, None),
+    ("GET /villages/{village_id}/assets", "satellite_assets", {"village_id": "village_id"}, None),
+    ("GET /dss/recommendations/{village_id} (assets)", "satellite_assets", {"village_id": "village_id", "asset_type": "water_body"}, None),
+    ("GET /schemes/{village_id}", "css_schemes", {"village_id": "village_id"}, None),
+    ("GET /dss/recommendations/{village_id}", "ds_recommendations", {"village_id": "village_id"}, None),
+    ("GET /data/validations/{validation_id}", "data_validations", {"id": "validation_id"}, None),
+]
+
+def plan_stages(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten an explain() plan tree into its stages"""
+    stages = [plan]
+    for child in [plan.get("inputStage")] + plan.get("inputStages", []):
+        if child:
+            stages.extend(plan_stages(child))
+    return stages
+
+@api_router.get("/admin/index-report")
+async def index_report():
+    """Explain each route's canonical query and flag the ones that scan a whole collection"""
+    if not mongodb_available or db is None:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    
+    report = []
+    for route, collection, query, sort in ROUTE_QUERIES:
+        try:
+            cursor = db[collection].find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+            explained = await cursor.explain()
+            planner = explained.get("queryPlanner", {})
+            winning = planner.get("winningPlan", {})
+            # Newer servers nest the classic plan under queryPlan
+            stages = plan_stages(winning.get("queryPlan", winning))
+            report.append({
+                "route": route,
+                "collection": collection,
+                "collscan": any(stage.get("stage") == "COLLSCAN" for stage in stages),
+                "in_memory_sort": any(stage.get("stage") == "SORT" for stage in stages),
+                "indexes": sorted({stage["indexName"] for stage in stages if "indexName" in stage}),
+                "stages": [stage.get("stage") for stage in stages]
+            })
+        except Exception as e:
+            report.append({"route": route, "collection": collection, "error": str(e)})
+    
+    return {
+        "collscans": [entry["route"] for entry in report if entry.get("collscan")],
+        "routes": report
+    }
+
+async def backfill_claim_locations():
+    """Copy state/district from villages onto claims written before they were denormalized"""
+    try:
+        village_ids = await db.forest_claims.distinct("village_id", {"state": {"$exists": False}})
+        if not village_ids:
+            return
         
-        return {
-            "state": state_name,
-            "total_claims": total_claims,
-            "approved_claims": approved_claims,
-            "pending_claims": pending_claims,
-            "progress_percentage": progress_percentage,
-            "status_breakdown": status_counts
-        }
+        updates = []
+        async for village in db.villages.find({"id": {"$in": village_ids}}, {"id": 1, "state": 1, "district": 1}):
+            updates.append(UpdateMany(
+                {"village_id": village["id"], "state": {"$exists": False}},
+                {"$set": {"state": village.get("state"), "district": village.get("district")}}
+            ))
         
+        if updates:
+            result = await db.forest_claims.bulk_write(updates, ordered=False)
+            print(f"🗺️  Backfilled state/district on {result.modified_count} claims")
     except Exception as e:
-        raise HTTPException(status_code=503, detail="Database unavailable")
+        print(f"❌ Claim location backfill failed: {e}")
+
+async def rollup_snapshot() -> Dict[tuple, int]:
+    return {
+        (rollup.get("state"), rollup.get("district"), rollup.get("status")): rollup.get("count", 0)
+        async for rollup in db.claim_rollups.find({}, {"_id": 0, "state": 1, "district": 1, "status": 1, "count": 1})
+    }
+
+async def reconcile_claim_rollups():
+    """Correct drift in claim_rollups by $inc-ing each bucket towards a fresh count of forest_claims"""
+    try:
+        # Snapshot the rollups on both sides of the scan and only correct buckets that did not
+        # move meanwhile; the correction is an $inc, so writes after the scan are kept too
+        before = await rollup_snapshot()
+        pipeline = [{"$group": {
+            "_id": {"state": "$state", "district": "$district", "status": "$status"},
+            "count": {"$sum": 1}
+        }}]
+        counted = {
+            (group["_id"].get("state"), group["_id"].get("district"), group["_id"].get("status")): group["count"]
+            async for group in db.forest_claims.aggregate(pipeline)
+        }
+        after = await rollup_snapshot()
+        reconciled_at = datetime.now(timezone.utc)
+        updates = []
+        for bucket in set(counted) | set(before):
+            if before.get(bucket) != after.get(bucket):
+                continue
+            delta = counted.get(bucket, 0) - before.get(bucket, 0)
+            if delta:
+                state, district, status = bucket
+                updates.append(UpdateOne(
+                    {"state": state, "district": district, "status": status},
+                    {"$inc": {"count": delta}, "$set": {"reconciled_at": reconciled_at}},
+                    upsert=True
+                ))
+        if updates:
+            await db.claim_rollups.bulk_write(updates, ordered=False)
+        # Buckets that no longer have any claims
+        await db.claim_rollups.delete_many({"count": {"$lte": 0}})
+        if updates:
+            dashboard_stats_cache.invalidate()
+    except Exception as e:
+        print(f"❌ Claim rollup reconciliation failed: {e}")
+
+async def claim_maintenance_loop():
+    """Backfill claim locations, then reconcile the rollups periodically"""
+    await backfill_claim_locations()
+    while True:
+        await reconcile_claim_rollups()
+        await asyncio.sleep(ROLLUP_RECONCILE_INTERVAL)
+
+async def recompute_dirty_recommendations() -> int:
+    """Recompute one batch of recommendations whose village assets changed; returns the batch size"""
+    dirty = await db.ds_recommendations.find(
+        {"dirty": True}, {"_id": 0, "village_id": 1, "assets_version": 1}
+    ).limit(DSS_RECOMPUTE_BATCH).to_list(DSS_RECOMPUTE_BATCH)
+    if not dirty:
+        return 0
+    
+    versions = {row["village_id"]: row.get("assets_version", 0) for row in dirty}
+    counts = await dss_asset_counts(list(versions))
+    # A village whose version moved on meanwhile stays dirty and is picked up next round
+    writes = [
+        recommendation_update(build_recommendation(village_id, counts[village_id]), version)
+        for village_id, version in versions.items()
+    ]
+    await db.ds_recommendations.bulk_write(writes, ordered=False)
+    return len(dirty)
+
+async def dss_recompute_loop():
+    """Keep stored DSS recommendations in step with new satellite assets"""
+    while True:
+        try:
+            # Full batches mean more may be waiting, so keep draining before sleeping
+            while await recompute_dirty_recommendations() == DSS_RECOMPUTE_BATCH:
+                pass
+        except Exception as e:
+            print(f"❌ DSS recompute failed: {e}")
+        await asyncio.sleep(DSS_RECOMPUTE_INTERVAL)
 
 # Include router
 app.include_router(api_router)
@@ -780,18 +2202,41 @@ app.include_router(api_router)
 # Health check
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "message": "FRA Atlas API is running"}
+    return {
+        "status": "healthy",
+        "message": "FRA Atlas API is running",
+        "validators": {
+            "default": validator_name(default_validator),
+            "registered": sorted(validator_registry),
+            "load_ms": validator_load_ms
+        }
+    }
 
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     print("🚀 Starting FRA Atlas API...")
+    load_validators()
+    print(f"🧪 Validators ready in {validator_load_ms:.1f} ms (default: {validator_name(default_validator)})")
+    await fail_orphaned_validations()
+    # Starting the progress Manager forks a server process; do it off the event loop, once
+    await asyncio.to_thread(get_validation_progress)
     if mongodb_available and db is not None:
+        await ensure_indexes()
+        start_background_task(claim_maintenance_loop())
+        start_background_task(watch_claim_changes())
+        start_background_task(dss_recompute_loop())
         print("🎯 Ready to serve requests with MongoDB!")
     else:
         print("⚠️  Running in offline mode - some features may be limited")
         print("🎯 API is ready for testing without database!")
 
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    if validation_pool is not None:
+        validation_pool.shutdown(cancel_futures=True)
+
 if __name__ == "__main__":
     import uvicorn
     print("🌱 FRA Atlas API Starting...")